@@ -5,30 +5,47 @@ Professional UAV Ground Control Station with multi-drone capability
 """
 
 import sys
-import os
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import QTimer
 
+from logging_config import get_logger
+from main_window import MainWindow
+
+logger = get_logger("main")
+
+# Console output, written in one call each to avoid per-line console writes
+STARTUP_BANNER = (
+    f"{'=' * 60}\n"
+    "ASRA Ground Control Station v2.0\n"
+    "Multi-Drone Professional Ground Control\n"
+    f"{'=' * 60}\n"
+    "\n"
+    "Features:\n"
+    "✓ Multi-drone support (up to 2 drones)\n"
+    "✓ Tabbed drone interface\n"
+    "✓ Global map with all drones\n"
+    "✓ Independent telemetry per drone\n"
+    "✓ Color-coded drone markers\n"
+    "✓ Real-time position tracking\n"
+    "✓ MAVLink communication\n"
+    "✓ Offline map caching\n"
+    "\n"
+    "Starting ASRA GCS v2.0...\n"
+    f"{'-' * 60}\n"
+)
+
+STARTED_MESSAGE = (
+    "ASRA GCS v2.0 started successfully!\n"
+    "Use Ctrl+N or menu to add drones\n"
+    "Global map shows all connected drones\n"
+    "Close the window to exit.\n"
+)
+
 def main():
     """Main application entry point"""
     
-    print("=" * 60)
-    print("ASRA Ground Control Station v2.0")
-    print("Multi-Drone Professional Ground Control")
-    print("=" * 60)
-    print()
-    print("Features:")
-    print("✓ Multi-drone support (up to 2 drones)")
-    print("✓ Tabbed drone interface")
-    print("✓ Global map with all drones")
-    print("✓ Independent telemetry per drone")
-    print("✓ Color-coded drone markers")
-    print("✓ Real-time position tracking")
-    print("✓ MAVLink communication")
-    print("✓ Offline map caching")
-    print()
-    print("Starting ASRA GCS v2.0...")
-    print("-" * 60)
+    sys.stdout.write(STARTUP_BANNER)
+    sys.stdout.flush()
     
     # Create Qt application
     app = QApplication(sys.argv)
@@ -36,9 +53,6 @@ def main():
     app.setApplicationVersion("2.0.0")
     
     try:
-        # Import main window
-        from main_window import MainWindow
-        
         # Create main window
         window = MainWindow()
         window.show()
@@ -57,18 +71,15 @@ def main():
         # Start map services after short delay
         QTimer.singleShot(500, start_map_services)
         
-        print("ASRA GCS v2.0 started successfully!")
-        print("Use Ctrl+N or menu to add drones")
-        print("Global map shows all connected drones")
-        print("Close the window to exit.")
+        sys.stdout.write(STARTED_MESSAGE)
+        sys.stdout.flush()
         
         # Run Qt event loop
         return app.exec_()
         
     except Exception as e:
         print(f"❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("ASRA GCS failed to start")
         return 1
 
 if __name__ == '__main__':
@@ -80,4 +91,5 @@ if __name__ == '__main__':
         sys.exit(0)
     except Exception as e:
         print(f"Critical error: {e}")
+        logger.exception("Critical error")
         sys.exit(1)
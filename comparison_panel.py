@@ -6,6 +6,48 @@ Properly measured with no overlapping text
 from PyQt5 import QtWidgets
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel
+from style_utils import qss_rules
+from telemetry_text import fmt_altitude, fmt_percent, fmt_speed, set_label_texts
+
+# Comparison columns: (name, color)
+DRONE_COLUMNS = (("ALPHA", "#00d4ff"), ("BRAVO", "#a78bfa"))
+
+# Single stylesheet for the whole panel; children are styled via their "role" property
+PANEL_STYLESHEET = """
+    ComparisonPanel {
+        background-color: #1a1a1a;
+        border: 1px solid #2a2a2a;
+        border-radius: 6px;
+    }
+    QLabel[role="icon"] {
+        font-size: 12pt;
+    }
+    QLabel[role="title"] {
+        color: white;
+        font-size: 10pt;
+        font-weight: bold;
+    }
+    QLabel[role="drone-name"] {
+        color: #9ca3af;
+        font-size: 8pt;
+        font-weight: bold;
+        font-family: 'Consolas', monospace;
+    }
+    QLabel[role="metric-label"] {
+        color: #9ca3af;
+        font-size: 8pt;
+    }
+    QLabel[role="metric-value"] {
+        color: white;
+        font-size: 8pt;
+        font-weight: bold;
+        font-family: 'Consolas', monospace;
+    }
+""" + qss_rules("""
+    QLabel[role="dot"][drone="{0}"] {{
+        background-color: {1};
+        border-radius: 4px;
+    }}""", DRONE_COLUMNS)
 
 
 class ComparisonPanel(QWidget):
@@ -17,6 +59,11 @@ class ComparisonPanel(QWidget):
         super().__init__(parent)
         self.setMinimumHeight(120)
         self.setMaximumHeight(150)
+        
+        # Last rendered values, used to skip redundant updates
+        self._last_values = None
+        self._metric_text = {}  # QLabel -> last text
+        
         self._setup_ui()
         
     def _setup_ui(self):
@@ -25,13 +72,7 @@ class ComparisonPanel(QWidget):
         layout.setContentsMargins(10, 10, 10, 10)
         layout.setSpacing(8)
         
-        self.setStyleSheet("""
-            ComparisonPanel {
-                background-color: #1a1a1a;
-                border: 1px solid #2a2a2a;
-                border-radius: 6px;
-            }
-        """)
+        self.setStyleSheet(PANEL_STYLESHEET)
         
         # Header (fixed height: 24px)
         header = QHBoxLayout()
@@ -40,11 +81,11 @@ class ComparisonPanel(QWidget):
         
         icon = QLabel("📊")
         icon.setFixedSize(16, 16)
-        icon.setStyleSheet("font-size: 12pt;")
+        icon.setProperty("role", "icon")
         
         title = QLabel("Comparison")
         title.setFixedHeight(18)
-        title.setStyleSheet("color: white; font-size: 10pt; font-weight: bold;")
+        title.setProperty("role", "title")
         
         header.addWidget(icon)
         header.addWidget(title)
@@ -57,24 +98,28 @@ class ComparisonPanel(QWidget):
         grid.setContentsMargins(0, 0, 0, 0)
         
         # Drone 1 column
-        d1_widget = self._create_drone_column("ALPHA", "#00d4ff")
-        self.d1_altitude = d1_widget[0]
-        self.d1_speed = d1_widget[1]
-        self.d1_battery = d1_widget[2]
+        d1_widget = self._create_drone_column(DRONE_COLUMNS[0][0])
+        self.d1_altitude_lbl = d1_widget[0]
+        self.d1_speed_lbl = d1_widget[1]
+        self.d1_battery_lbl = d1_widget[2]
         
         grid.addWidget(d1_widget[3], 0, 0)
         
         # Drone 2 column
-        d2_widget = self._create_drone_column("BRAVO", "#a78bfa")
-        self.d2_altitude = d2_widget[0]
-        self.d2_speed = d2_widget[1]
-        self.d2_battery = d2_widget[2]
+        d2_widget = self._create_drone_column(DRONE_COLUMNS[1][0])
+        self.d2_altitude_lbl = d2_widget[0]
+        self.d2_speed_lbl = d2_widget[1]
+        self.d2_battery_lbl = d2_widget[2]
         
         grid.addWidget(d2_widget[3], 0, 1)
         
+        # Update order used by set_metrics
+        self._metric_labels = (self.d1_altitude_lbl, self.d1_speed_lbl, self.d1_battery_lbl,
+                               self.d2_altitude_lbl, self.d2_speed_lbl, self.d2_battery_lbl)
+        
         layout.addLayout(grid)
         
-    def _create_drone_column(self, name, color):
+    def _create_drone_column(self, name):
         """Create comparison column for one drone"""
         container = QWidget()
         container.setFixedHeight(70)
@@ -89,11 +134,12 @@ class ComparisonPanel(QWidget):
         
         dot = QLabel()
         dot.setFixedSize(8, 8)
-        dot.setStyleSheet(f"background-color: {color}; border-radius: 4px;")
+        dot.setProperty("role", "dot")
+        dot.setProperty("drone", name)
         
         label = QLabel(name)
         label.setFixedHeight(14)
-        label.setStyleSheet("color: #9ca3af; font-size: 8pt; font-weight: bold; font-family: 'Consolas', monospace;")
+        label.setProperty("role", "drone-name")
         
         header.addWidget(dot)
         header.addWidget(label)
@@ -101,18 +147,18 @@ class ComparisonPanel(QWidget):
         layout.addLayout(header)
         
         # Metrics (3 fixed-height rows)
-        alt_row = self._create_metric_row("Alt", "0m")
-        spd_row = self._create_metric_row("Spd", "0m/s")
-        bat_row = self._create_metric_row("Bat", "100%")
+        alt_row, alt_val = self._create_metric_row("Alt", "0m")
+        spd_row, spd_val = self._create_metric_row("Spd", "0m/s")
+        bat_row, bat_val = self._create_metric_row("Bat", "100%")
         
         layout.addLayout(alt_row)
         layout.addLayout(spd_row)
         layout.addLayout(bat_row)
         
-        return (alt_row, spd_row, bat_row, container)
+        return (alt_val, spd_val, bat_val, container)
     
     def _create_metric_row(self, label, value):
-        """Create metric row with fixed sizing"""
+        """Create metric row with fixed sizing, returns (row, value label)"""
         row = QHBoxLayout()
         row.setSpacing(6)
         row.setContentsMargins(0, 0, 0, 0)
@@ -120,46 +166,46 @@ class ComparisonPanel(QWidget):
         lbl = QLabel(label)
         lbl.setFixedWidth(30)
         lbl.setFixedHeight(14)
-        lbl.setStyleSheet("color: #9ca3af; font-size: 8pt;")
+        lbl.setProperty("role", "metric-label")
         
         val = QLabel(value)
         val.setObjectName("value")
         val.setFixedHeight(14)
         val.setAlignment(Qt.AlignRight)
-        val.setStyleSheet("color: white; font-size: 8pt; font-weight: bold; font-family: 'Consolas', monospace;")
+        val.setProperty("role", "metric-value")
         
         row.addWidget(lbl)
         row.addStretch()
         row.addWidget(val)
         
-        return row
+        return row, val
     
     def update_comparison(self, drone1_data, drone2_data):
         """Update comparison with drone data"""
-        # Drone 1
         alt1 = drone1_data.get('altitude_agl', 0)
-        self._update_metric(self.d1_altitude, f"{alt1:.0f}m" if alt1 < 1000 else f"{alt1/1000:.1f}km")
-        
         spd1 = drone1_data.get('ground_speed', 0)
-        self._update_metric(self.d1_speed, f"{spd1:.1f}m/s")
-        
         bat1 = drone1_data.get('battery_percent', 0)
-        self._update_metric(self.d1_battery, f"{bat1:.0f}%")
-        
-        # Drone 2
         alt2 = drone2_data.get('altitude_agl', 0)
-        self._update_metric(self.d2_altitude, f"{alt2:.0f}m" if alt2 < 1000 else f"{alt2/1000:.1f}km")
-        
         spd2 = drone2_data.get('ground_speed', 0)
-        self._update_metric(self.d2_speed, f"{spd2:.1f}m/s")
-        
         bat2 = drone2_data.get('battery_percent', 0)
-        self._update_metric(self.d2_battery, f"{bat2:.0f}%")
+        
+        # Nothing to do if the raw values are unchanged since last tick
+        values = (alt1, spd1, bat1, alt2, spd2, bat2)
+        if values == self._last_values:
+            return
+        self._last_values = values
+        
+        self.set_metrics(
+            (fmt_altitude(alt1), fmt_speed(spd1), fmt_percent(bat1)),
+            (fmt_altitude(alt2), fmt_speed(spd2), fmt_percent(bat2)),
+        )
     
-    def _update_metric(self, layout, value):
-        """Update metric value"""
-        for i in range(layout.count()):
-            widget = layout.itemAt(i).widget()
-            if widget and widget.objectName() == "value":
-                widget.setText(value)
-                break
+    def set_metrics(self, drone1_text, drone2_text):
+        """
+        Apply pre-formatted metrics
+        
+        Args:
+            drone1_text: (altitude, speed, battery) strings for drone 1
+            drone2_text: (altitude, speed, battery) strings for drone 2
+        """
+        set_label_texts(self, self._metric_text, zip(self._metric_labels, drone1_text + drone2_text))
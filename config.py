@@ -5,10 +5,58 @@ Centralized configuration system with JSON file support and performance optimiza
 
 import os
 import json
+import atexit
+import functools
 import logging
+import threading
+import time
+import weakref
+from dataclasses import dataclass
 from enum import Enum
+from pathlib import Path
 from typing import Dict, Any, Optional
 
+# Optional fast JSON backend
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional compiled schema validation
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+# Runtime directories, created once per process by Config._setup_directories
+_APP_DIRS = (Path("logs"), Path("cache"), Path("config"))
+_DIRS_READY = False
+
+# Delay before an autosave triggered by Config.set is written
+AUTOSAVE_DEBOUNCE_SEC = 0.5
+
+# Configs whose pending autosave is written at interpreter exit
+_AUTOSAVE_CONFIGS = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_autosaves():
+    """Write any autosave still waiting out its debounce"""
+    for cfg in list(_AUTOSAVE_CONFIGS):
+        cfg.flush()
+
+
+def _json_dumps(data: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes (orjson when available)"""
+    if orjson:
+        return orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(data, indent=2 if indent else None, default=str).encode("utf-8")
+
+
+def _json_loads(raw) -> Any:
+    """Parse JSON bytes/str (orjson when available)"""
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
 class MapProvider(Enum):
     """Free and open-source map providers only"""
     OPENSTREETMAP = "OpenStreetMap"
@@ -52,20 +100,22 @@ class Config:
             "min_zoom": 10,
             "max_zoom": 19,  # Tile provider maximum
             "tile_size": 256,
+            "tile_format": "webp",  # Cache encoding for downloaded tiles ("webp" or "original")
             "max_cache_tiles": 400,  # Optimized from 1000
             "cache_cleanup_threshold": 450,
             "preload_radius": 1,  # Tiles to preload around viewport
+            "prefetch_lookahead_sec": 10,  # Prefetch tiles where each UAV will be this far ahead
             "show_grid": False,
             "show_performance_stats": False
         },
         
         # Network & Tile Download Settings
         "network": {
-            "max_concurrent_downloads": 4,  # Optimized from 12
+            "max_concurrent_downloads": 16,  # Tile fetches are latency-bound, not CPU-bound
             "download_timeout": 5,
             "retry_attempts": 2,
             "retry_delay": 0.1,
-            "connection_pool_size": 10,  # Reduced from 20
+            "connection_pool_size": 16,  # One keep-alive connection per download worker
             "user_agent": "ASRA-GCS/2.0"
         },
         
@@ -83,7 +133,8 @@ class Config:
                 "extra2": 2    # Hz
             },
             "message_validation": True,
-            "auto_reconnect": True
+            "auto_reconnect": True,
+            "low_latency_serial": True  # ASYNC_LOW_LATENCY / FTDI latency_timer=1 on Linux
         },
         
         # Performance Monitoring
@@ -119,6 +170,9 @@ class Config:
         }
     }
     
+    # Serialized once; parsing it yields an independent deep copy of the defaults
+    _defaults_json = _json_dumps(_defaults)
+    
     # Free tile provider URLs (no API keys required)
     _provider_urls = {
         MapProvider.OPENSTREETMAP: "https://tile.openstreetmap.org/{z}/{x}/{y}.png",
@@ -132,22 +186,47 @@ class Config:
     
     def __init__(self, config_file: str = "config.json"):
         self.config_file = config_file
-        self.config = self._defaults.copy()
+        self.config = self._fresh_defaults()
+        
+        # Shared HTTP session, created on first use
+        self._http_session = None
+        self._http_session_lock = threading.Lock()
+        
+        # Debounced autosave: set() serializes a snapshot, one writer thread saves it
+        self._save_cond = threading.Condition()
+        self._pending_save = None  # (generation, JSON bytes) waiting for the writer
+        self._save_deadline = 0.0  # monotonic time the pending snapshot is due
+        self._save_gen = 0         # Generation of the newest snapshot
+        self._save_thread = None
+        self._write_lock = threading.Lock()
+        self._written_gen = 0      # Generation of the snapshot on disk
+        _AUTOSAVE_CONFIGS.add(self)
+        
         self._setup_directories()
         self.load()
         
+        # Cached app.auto_save_config, kept in sync by set() and reset_to_defaults()
+        self._auto_save = bool(self.get("app", "auto_save_config", True))
+        
+    def _fresh_defaults(self) -> Dict[str, Any]:
+        """Deep copy of the defaults so nested sections never alias _defaults"""
+        return _json_loads(self._defaults_json)
+        
     def _setup_directories(self):
-        """Create necessary directories"""
-        os.makedirs("logs", exist_ok=True)
-        os.makedirs("cache", exist_ok=True)
-        os.makedirs("config", exist_ok=True)
+        """Create necessary directories (once per process)"""
+        global _DIRS_READY
+        if _DIRS_READY:
+            return
+        for directory in _APP_DIRS:
+            directory.mkdir(parents=True, exist_ok=True)
+        _DIRS_READY = True
         
     def load(self) -> bool:
         """Load configuration from JSON file"""
         try:
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    user_config = json.load(f)
+                with open(self.config_file, 'rb') as f:
+                    user_config = _json_loads(f.read())
                     self._merge_config(self.config, user_config)
                 logging.info(f"Configuration loaded from {self.config_file}")
                 return True
@@ -158,23 +237,42 @@ class Config:
         
     def save(self) -> bool:
         """Save current configuration to JSON file"""
-        try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.config, f, indent=2, default=str)
-            logging.info(f"Configuration saved to {self.config_file}")
-            return True
-        except Exception as e:
-            logging.error(f"Failed to save config: {e}")
-            return False
+        with self._save_cond:
+            snapshot = self._snapshot()
+            self._pending_save = None  # Superseded by this snapshot
+        return self._write(*snapshot)
+        
+    def _snapshot(self):
+        """Serialize the config on the caller's thread (call with _save_cond held)"""
+        self._save_gen += 1
+        return self._save_gen, _json_dumps(self.config, indent=True)
+        
+    def _write(self, gen: int, data: bytes) -> bool:
+        """Write a snapshot unless a newer one is already on disk"""
+        with self._write_lock:
+            if gen <= self._written_gen:
+                return True
+            try:
+                with open(self.config_file, 'wb') as f:
+                    f.write(data)
+                self._written_gen = gen
+                logging.info(f"Configuration saved to {self.config_file}")
+                return True
+            except Exception as e:
+                logging.error(f"Failed to save config: {e}")
+                return False
             
     def _merge_config(self, default: Dict[str, Any], user: Dict[str, Any]):
-        """Recursively merge user config with defaults"""
-        for key, value in user.items():
-            if key in default:
-                if isinstance(default[key], dict) and isinstance(value, dict):
-                    self._merge_config(default[key], value)
-                else:
-                    default[key] = value
+        """Merge user config into defaults (iterative walk over nested sections)"""
+        stack = [(default, user)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                if key in target:
+                    if isinstance(target[key], dict) and isinstance(value, dict):
+                        stack.append((target[key], value))
+                    else:
+                        target[key] = value
                     
     def get(self, section: str, key: str = None, default: Any = None) -> Any:
         """Get configuration value"""
@@ -191,38 +289,107 @@ class Config:
             self.config[section] = {}
         self.config[section][key] = value
         
-        if self.get("app", "auto_save_config", True):
-            self.save()
+        if section == "app" and key == "auto_save_config":
+            self._auto_save = bool(value)
+        
+        if self._auto_save:
+            self._schedule_save()
+            
+    def _schedule_save(self):
+        """Snapshot now; the writer thread saves the latest snapshot once set() calls pause"""
+        with self._save_cond:
+            self._pending_save = self._snapshot()
+            self._save_deadline = time.monotonic() + AUTOSAVE_DEBOUNCE_SEC
+            if self._save_thread is None:
+                self._save_thread = threading.Thread(target=self._autosave_loop,
+                                                     name="ConfigAutosave", daemon=True)
+                self._save_thread.start()
+            self._save_cond.notify()
+            
+    def _autosave_loop(self):
+        """Writer thread: save the pending snapshot AUTOSAVE_DEBOUNCE_SEC after the last set()"""
+        while True:
+            with self._save_cond:
+                while True:
+                    if self._pending_save is None:
+                        self._save_cond.wait()
+                        continue
+                    remaining = self._save_deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._save_cond.wait(remaining)
+                snapshot, self._pending_save = self._pending_save, None
+            self._write(*snapshot)
+            
+    def flush(self) -> bool:
+        """Write pending autosave changes now"""
+        with self._save_cond:
+            snapshot, self._pending_save = self._pending_save, None
+        if snapshot is None:
+            return False
+        return self._write(*snapshot)
             
     def get_provider_url(self, provider: MapProvider) -> str:
         """Get tile URL for provider"""
         return self._provider_urls.get(provider, self._provider_urls[MapProvider.OPENSTREETMAP])
         
-    def get_available_providers(self) -> list:
-        """Get list of available free map providers"""
-        return [provider.value for provider in MapProvider]
+    def get_http_session(self):
+        """Get the shared keep-alive HTTP session used for all tile providers"""
+        with self._http_session_lock:
+            if self._http_session is None:
+                # Imported lazily so loading config doesn't pull in the HTTP stack
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+                
+                # Keep at least one pooled connection per download worker
+                pool_size = max(self.get("network", "connection_pool_size", 16),
+                                self.get("network", "max_concurrent_downloads", 16))
+                retry_strategy = Retry(
+                    total=self.get("network", "retry_attempts", 2),
+                    backoff_factor=self.get("network", "retry_delay", 0.1),
+                    status_forcelist=[429, 500, 502, 503, 504],
+                )
+                adapter = HTTPAdapter(max_retries=retry_strategy, pool_connections=pool_size, pool_maxsize=pool_size)
+                
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update({
+                    'User-Agent': self.get("network", "user_agent", "ASRA-GCS/2.0"),
+                    'Accept': 'image/*,*/*;q=0.8',
+                    'Accept-Encoding': 'gzip, deflate',
+                    'Connection': 'keep-alive',
+                    'Cache-Control': 'max-age=3600'  # Hint for caching
+                })
+                self._http_session = session
+            return self._http_session
+        
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def get_available_providers() -> tuple:
+        """Get available free map provider names (built once, immutable)"""
+        return tuple(provider.value for provider in MapProvider)
         
     def reset_to_defaults(self):
         """Reset configuration to defaults"""
-        self.config = self._defaults.copy()
+        self.config = self._fresh_defaults()
+        self._auto_save = bool(self.get("app", "auto_save_config", True))
         self.save()
         
     def validate_config(self) -> list:
         """Validate configuration and return list of issues"""
         issues = []
         
-        # Validate numeric ranges
-        if not (1 <= self.get("map", "min_zoom") <= 22):
-            issues.append("map.min_zoom must be between 1 and 22")
-            
-        if not (1 <= self.get("map", "max_zoom") <= 22):
-            issues.append("map.max_zoom must be between 1 and 22")
-            
-        if not (50 <= self.get("map", "max_cache_tiles") <= 2000):
-            issues.append("map.max_cache_tiles must be between 50 and 2000")
-            
-        if not (1 <= self.get("network", "max_concurrent_downloads") <= 20):
-            issues.append("network.max_concurrent_downloads must be between 1 and 20")
+        # Validate value types and ranges. The compiled schema is the fast
+        # pass but stops at its first violation, so list them all on failure
+        if _validate_schema:
+            try:
+                _validate_schema(self.config)
+            except fastjsonschema.JsonSchemaException as e:
+                issues.extend(self._validate_ranges() or [e.message])
+        else:
+            issues.extend(self._validate_ranges())
             
         # Validate file paths
         log_dir = os.path.dirname(self.get("logging", "file_path"))
@@ -233,6 +400,88 @@ class Config:
                 issues.append(f"Cannot create log directory: {log_dir}")
                 
         return issues
+        
+    def _validate_ranges(self) -> list:
+        """Check every CONFIG_SCHEMA key in plain Python, reporting all violations"""
+        issues = []
+        for section, section_schema in CONFIG_SCHEMA["properties"].items():
+            values = self.config.get(section)
+            if not isinstance(values, dict):
+                issues.append(f"{section} must be an object")
+                continue
+            for key, rule in section_schema["properties"].items():
+                if key in values:
+                    issue = _check_schema_rule(values[key], rule)
+                    if issue:
+                        issues.append(f"{section}.{key} {issue}")
+        return issues
+
+
+def _check_schema_rule(value: Any, rule: Dict[str, Any]) -> Optional[str]:
+    """Apply the subset of JSON Schema used by CONFIG_SCHEMA; returns the problem or None"""
+    kind = rule.get("type")
+    if kind is not None and not _SCHEMA_TYPE_CHECKS[kind](value):
+        return f"must be {'an' if kind == 'integer' else 'a'} {kind}"
+    if "enum" in rule and value not in rule["enum"]:
+        return f"must be one of {', '.join(map(str, rule['enum']))}"
+    low, high = rule.get("minimum"), rule.get("maximum")
+    if low is not None and high is not None:
+        if not low <= value <= high:
+            return f"must be between {low} and {high}"
+    elif low is not None and value < low:
+        return f"must be at least {low}"
+    elif high is not None and value > high:
+        return f"must be at most {high}"
+    if "exclusiveMinimum" in rule and value <= rule["exclusiveMinimum"]:
+        return f"must be greater than {rule['exclusiveMinimum']}"
+    return None
+
+
+# JSON Schema "type" keywords used by CONFIG_SCHEMA (bool is not a number in JSON)
+_SCHEMA_TYPE_CHECKS = {
+    "boolean": lambda v: isinstance(v, bool),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "string": lambda v: isinstance(v, str),
+}
+
+# Schema for value ranges checked by Config.validate_config
+CONFIG_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "app": {"type": "object", "properties": {
+            "auto_save_config": {"type": "boolean"},
+            "window_width": {"type": "integer", "minimum": 1},
+            "window_height": {"type": "integer", "minimum": 1},
+        }},
+        "ui": {"type": "object", "properties": {
+            "update_rate_ms": {"type": "integer", "minimum": 1},
+            "button_feedback_ms": {"type": "integer", "minimum": 0},
+            "max_fps": {"type": "integer", "minimum": 1},
+        }},
+        "map": {"type": "object", "properties": {
+            "min_zoom": {"type": "integer", "minimum": 1, "maximum": 22},
+            "max_zoom": {"type": "integer", "minimum": 1, "maximum": 22},
+            "max_cache_tiles": {"type": "integer", "minimum": 50, "maximum": 2000},
+            "tile_format": {"enum": ["webp", "original"]},
+        }},
+        "network": {"type": "object", "properties": {
+            "max_concurrent_downloads": {"type": "integer", "minimum": 1, "maximum": 20},
+            "download_timeout": {"type": "number", "exclusiveMinimum": 0},
+            "connection_pool_size": {"type": "integer", "minimum": 1},
+        }},
+        "mavlink": {"type": "object", "properties": {
+            "heartbeat_timeout": {"type": "number", "exclusiveMinimum": 0},
+            "connection_timeout": {"type": "number", "exclusiveMinimum": 0},
+        }},
+        "logging": {"type": "object", "properties": {
+            "file_path": {"type": "string"},
+        }},
+    },
+}
+
+# Compiled once at import; None when fastjsonschema is not installed
+_validate_schema = fastjsonschema.compile(CONFIG_SCHEMA) if fastjsonschema else None
 
 # Global configuration instance
 config = Config()
@@ -242,13 +491,20 @@ class PerformanceSettings:
     """Performance settings derived from config"""
     
     @staticmethod
-    def get_optimal_settings():
-        """Get optimal performance settings based on system"""
+    @functools.lru_cache(maxsize=1)
+    def get_system_specs():
+        """Get (cpu_count, memory_gb) - probed once, specs don't change at runtime"""
         import psutil
         
-        # Get system specs
-        cpu_count = psutil.cpu_count()
+        cpu_count = os.cpu_count() or 1
         memory_gb = psutil.virtual_memory().total / (1024**3)
+        return cpu_count, memory_gb
+    
+    @staticmethod
+    def get_optimal_settings():
+        """Get optimal performance settings based on system"""
+        # Get system specs
+        cpu_count, memory_gb = PerformanceSettings.get_system_specs()
         
         # Adjust settings based on system capabilities
         optimal = {
@@ -261,10 +517,53 @@ class PerformanceSettings:
         
         return optimal
 
+@dataclass(frozen=True)
+class FrozenConfig:
+    """
+    Read-only snapshot of settings read on hot paths
+    Slot attribute access avoids the nested dict lookups in Config.get
+    """
+    __slots__ = (
+        "ui_update_rate_ms", "ui_button_feedback_ms",
+        "map_max_cache_tiles", "map_cache_cleanup_threshold", "map_tile_format",
+        "network_max_concurrent_downloads", "network_download_timeout", "network_user_agent",
+        "mavlink_heartbeat_timeout", "mavlink_connection_timeout",
+    )
+    
+    ui_update_rate_ms: int
+    ui_button_feedback_ms: int
+    map_max_cache_tiles: int
+    map_cache_cleanup_threshold: int
+    map_tile_format: str
+    network_max_concurrent_downloads: int
+    network_download_timeout: float
+    network_user_agent: str
+    mavlink_heartbeat_timeout: float
+    mavlink_connection_timeout: float
+    
+    @classmethod
+    def from_config(cls, cfg: Config) -> "FrozenConfig":
+        """Build snapshot from a loaded Config"""
+        return cls(
+            ui_update_rate_ms=cfg.get("ui", "update_rate_ms", 100),
+            ui_button_feedback_ms=cfg.get("ui", "button_feedback_ms", 150),
+            map_max_cache_tiles=cfg.get("map", "max_cache_tiles", 400),
+            map_cache_cleanup_threshold=cfg.get("map", "cache_cleanup_threshold", 450),
+            map_tile_format=cfg.get("map", "tile_format", "webp"),
+            network_max_concurrent_downloads=cfg.get("network", "max_concurrent_downloads", 16),
+            network_download_timeout=cfg.get("network", "download_timeout", 5),
+            network_user_agent=cfg.get("network", "user_agent", "ASRA-GCS/2.0"),
+            mavlink_heartbeat_timeout=cfg.get("mavlink", "heartbeat_timeout", 3.0),
+            mavlink_connection_timeout=cfg.get("mavlink", "connection_timeout", 10.0),
+        )
+
+# Hot-path settings snapshot
+CFG = FrozenConfig.from_config(config)
+
 # Export commonly used values
-UI_UPDATE_RATE = config.get("ui", "update_rate_ms", 100)
-BUTTON_FEEDBACK_DURATION = config.get("ui", "button_feedback_ms", 150)
-MAX_CACHE_TILES = config.get("map", "max_cache_tiles", 400)
-MAX_CONCURRENT_DOWNLOADS = config.get("network", "max_concurrent_downloads", 4)
-HEARTBEAT_TIMEOUT = config.get("mavlink", "heartbeat_timeout", 3.0)
-CONNECTION_TIMEOUT = config.get("mavlink", "connection_timeout", 10.0)
\ No newline at end of file
+UI_UPDATE_RATE = CFG.ui_update_rate_ms
+BUTTON_FEEDBACK_DURATION = CFG.ui_button_feedback_ms
+MAX_CACHE_TILES = CFG.map_max_cache_tiles
+MAX_CONCURRENT_DOWNLOADS = CFG.network_max_concurrent_downloads
+HEARTBEAT_TIMEOUT = CFG.mavlink_heartbeat_timeout
+CONNECTION_TIMEOUT = CFG.mavlink_connection_timeout
@@ -4,10 +4,126 @@ Centralized connection panel for all drones
 Matches React UI left sidebar
 """
 
-import serial.tools.list_ports
+from functools import partial
 from PyQt5 import QtCore, QtWidgets
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QGroupBox
+from port_scanner import get_port_scanner, populate_port_combo
+from style_utils import qss_rules, set_style_property
+
+
+# Connection groups: (title, drone_id, color)
+DRONE_GROUPS = (("Drone 1", "drone_1", "#00d4ff"), ("Drone 2", "drone_2", "#a78bfa"))
+
+# Single stylesheet for the whole sidebar; per-drone groups are styled by objectName
+SIDEBAR_STYLESHEET = """
+    ConnectionSidebar {
+        background-color: #0a0a0a;
+        border-right: 1px solid #2a2a2a;
+    }
+    QGroupBox {
+        background-color: #1a1a1a;
+        border: 1px solid #2a2a2a;
+        border-radius: 6px;
+        padding: 12px;
+        margin-top: 8px;
+        font-weight: bold;
+        color: #00d4ff;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        subcontrol-position: top left;
+        padding: 0 6px;
+    }
+    QLabel {
+        color: #9ca3af;
+        font-size: 9pt;
+    }
+    QComboBox {
+        background-color: #0a0a0a;
+        border: 1px solid #2a2a2a;
+        border-radius: 4px;
+        padding: 6px;
+        color: white;
+        font-size: 9pt;
+    }
+    QComboBox::drop-down {
+        border: none;
+    }
+    QComboBox::down-arrow {
+        image: none;
+        border-left: 4px solid transparent;
+        border-right: 4px solid transparent;
+        border-top: 6px solid #9ca3af;
+        margin-right: 6px;
+    }
+    QPushButton {
+        background-color: #0078d4;
+        border: none;
+        border-radius: 4px;
+        padding: 8px;
+        color: white;
+        font-weight: bold;
+        font-size: 9pt;
+    }
+    QPushButton:hover {
+        background-color: #1084d8;
+    }
+    QPushButton:pressed {
+        background-color: #005a9e;
+    }
+    QPushButton:disabled {
+        background-color: #404040;
+        color: #808080;
+    }
+    QLabel[role="drone-status"] {
+        font-size: 9pt;
+    }
+    QLabel[role="drone-status"][state="connected"] {
+        color: #00ff88;
+    }
+    QLabel[role="drone-status"][state="connecting"] {
+        color: #ffa500;
+    }
+    QLabel[role="drone-status"][state="disconnected"] {
+        color: #ff3333;
+    }
+    QLabel[role="system-status"] {
+        font-size: 10pt;
+        font-weight: bold;
+    }
+    QLabel[role="system-status"][state="active"] {
+        color: #00ff88;
+    }
+    QLabel[role="system-status"][state="partial"] {
+        color: #ffa500;
+    }
+    QLabel[role="system-status"][state="ready"] {
+        color: #9ca3af;
+    }
+    QPushButton[role="connect"] {
+        background-color: #00aa00;
+    }
+    QPushButton[role="connect"]:hover {
+        background-color: #00cc00;
+    }
+    QPushButton[role="connect"]:pressed {
+        background-color: #008800;
+    }
+    QPushButton[role="disconnect"] {
+        background-color: #aa0000;
+    }
+    QPushButton[role="disconnect"]:hover {
+        background-color: #cc0000;
+    }
+    QPushButton[role="disconnect"]:pressed {
+        background-color: #880000;
+    }
+""" + qss_rules("""
+    QGroupBox#{1}_group {{
+        border: 1px solid {2}40;
+        color: {2};
+    }}""", DRONE_GROUPS)
 
 
 class ConnectionSidebar(QWidget):
@@ -21,9 +137,25 @@ class ConnectionSidebar(QWidget):
     def __init__(self, drone_manager, parent=None):
         super().__init__(parent)
         self.drone_manager = drone_manager
+        
+        # Drones are pre-created by MainWindow before the sidebar is built
+        self.drone1 = drone_manager.get_drone("drone_1")
+        self.drone2 = drone_manager.get_drone("drone_2")
+        
         self.setFixedWidth(250)
+        self._port_combos = []
+        self._widgets = {}  # drone_id -> {"connect", "disconnect", "status", "port", "baud"}
+        
+        # Last displayed state, so per-tick status updates only touch labels on change
+        self._last_connected = {}
+        self._last_count = None
         self._setup_ui()
         
+        # Port enumeration runs in the background; combos start from the cached list
+        self.port_scanner = get_port_scanner()
+        self.port_scanner.ports_updated.connect(self._on_ports_updated)
+        self.port_scanner.refresh()
+        
     def _setup_ui(self):
         """Create sidebar UI"""
         layout = QVBoxLayout(self)
@@ -31,67 +163,7 @@ class ConnectionSidebar(QWidget):
         layout.setSpacing(12)
         
         # Sidebar styling
-        self.setStyleSheet("""
-            ConnectionSidebar {
-                background-color: #0a0a0a;
-                border-right: 1px solid #2a2a2a;
-            }
-            QGroupBox {
-                background-color: #1a1a1a;
-                border: 1px solid #2a2a2a;
-                border-radius: 6px;
-                padding: 12px;
-                margin-top: 8px;
-                font-weight: bold;
-                color: #00d4ff;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                subcontrol-position: top left;
-                padding: 0 6px;
-            }
-            QLabel {
-                color: #9ca3af;
-                font-size: 9pt;
-            }
-            QComboBox {
-                background-color: #0a0a0a;
-                border: 1px solid #2a2a2a;
-                border-radius: 4px;
-                padding: 6px;
-                color: white;
-                font-size: 9pt;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border-left: 4px solid transparent;
-                border-right: 4px solid transparent;
-                border-top: 6px solid #9ca3af;
-                margin-right: 6px;
-            }
-            QPushButton {
-                background-color: #0078d4;
-                border: none;
-                border-radius: 4px;
-                padding: 8px;
-                color: white;
-                font-weight: bold;
-                font-size: 9pt;
-            }
-            QPushButton:hover {
-                background-color: #1084d8;
-            }
-            QPushButton:pressed {
-                background-color: #005a9e;
-            }
-            QPushButton:disabled {
-                background-color: #404040;
-                color: #808080;
-            }
-        """)
+        self.setStyleSheet(SIDEBAR_STYLESHEET)
         
         # Title
         title = QLabel("CONNECTION")
@@ -104,11 +176,11 @@ class ConnectionSidebar(QWidget):
         layout.addWidget(title)
         
         # Drone 1 connection
-        self.drone1_group = self._create_drone_connection_group("Drone 1", "drone_1", "#00d4ff")
+        self.drone1_group = self._create_drone_connection_group(*DRONE_GROUPS[0])
         layout.addWidget(self.drone1_group)
         
         # Drone 2 connection
-        self.drone2_group = self._create_drone_connection_group("Drone 2", "drone_2", "#a78bfa")
+        self.drone2_group = self._create_drone_connection_group(*DRONE_GROUPS[1])
         layout.addWidget(self.drone2_group)
         
         # System status
@@ -117,7 +189,8 @@ class ConnectionSidebar(QWidget):
         status_layout.setSpacing(6)
         
         self.lbl_status = QLabel("● Ready")
-        self.lbl_status.setStyleSheet("color: #00ff88; font-size: 10pt; font-weight: bold;")
+        self.lbl_status.setProperty("role", "system-status")
+        self.lbl_status.setProperty("state", "ready")
         status_layout.addWidget(self.lbl_status)
         
         self.lbl_connected = QLabel("Connected: 0/2")
@@ -131,17 +204,7 @@ class ConnectionSidebar(QWidget):
     def _create_drone_connection_group(self, name, drone_id, color):
         """Create connection controls for one drone"""
         group = QGroupBox(name)
-        group.setStyleSheet(f"""
-            QGroupBox {{
-                background-color: #1a1a1a;
-                border: 1px solid {color}40;
-                border-radius: 6px;
-                padding: 12px;
-                margin-top: 8px;
-                font-weight: bold;
-                color: {color};
-            }}
-        """)
+        group.setObjectName(f"{drone_id}_group")
         
         layout = QVBoxLayout(group)
         layout.setSpacing(8)
@@ -153,11 +216,12 @@ class ConnectionSidebar(QWidget):
         lbl_port = QLabel("Port:")
         combo_port = QComboBox()
         combo_port.setObjectName(f"{drone_id}_port")
-        self._refresh_ports(combo_port)
+        populate_port_combo(combo_port, get_port_scanner().cached_ports())
+        self._port_combos.append(combo_port)
         
         btn_refresh = QPushButton("↻")
         btn_refresh.setFixedWidth(32)
-        btn_refresh.clicked.connect(lambda: self._refresh_ports(combo_port))
+        btn_refresh.clicked.connect(self._refresh_ports)
         
         port_row = QHBoxLayout()
         port_row.addWidget(combo_port, 1)
@@ -185,36 +249,14 @@ class ConnectionSidebar(QWidget):
         # Connect/Disconnect buttons
         btn_connect = QPushButton("Connect")
         btn_connect.setObjectName(f"{drone_id}_connect")
-        btn_connect.setStyleSheet("""
-            QPushButton {
-                background-color: #00aa00;
-            }
-            QPushButton:hover {
-                background-color: #00cc00;
-            }
-            QPushButton:pressed {
-                background-color: #008800;
-            }
-        """)
-        btn_connect.clicked.connect(
-            lambda: self._on_connect(drone_id, combo_port.currentText(), int(combo_baud.currentText()))
-        )
+        btn_connect.setProperty("role", "connect")
+        btn_connect.clicked.connect(partial(self._on_click_connect, drone_id))
         
         btn_disconnect = QPushButton("Disconnect")
         btn_disconnect.setObjectName(f"{drone_id}_disconnect")
         btn_disconnect.setEnabled(False)
-        btn_disconnect.setStyleSheet("""
-            QPushButton {
-                background-color: #aa0000;
-            }
-            QPushButton:hover {
-                background-color: #cc0000;
-            }
-            QPushButton:pressed {
-                background-color: #880000;
-            }
-        """)
-        btn_disconnect.clicked.connect(lambda: self._on_disconnect(drone_id))
+        btn_disconnect.setProperty("role", "disconnect")
+        btn_disconnect.clicked.connect(partial(self._on_disconnect, drone_id))
         
         layout.addWidget(btn_connect)
         layout.addWidget(btn_disconnect)
@@ -222,16 +264,33 @@ class ConnectionSidebar(QWidget):
         # Status indicator
         status = QLabel("● Disconnected")
         status.setObjectName(f"{drone_id}_status")
-        status.setStyleSheet("color: #ff3333; font-size: 9pt;")
+        status.setProperty("role", "drone-status")
+        status.setProperty("state", "disconnected")
         layout.addWidget(status)
         
+        self._widgets[drone_id] = {
+            "connect": btn_connect,
+            "disconnect": btn_disconnect,
+            "status": status,
+            "port": combo_port,
+            "baud": combo_baud,
+        }
+        
         return group
     
-    def _refresh_ports(self, combo):
-        """Refresh COM ports in dropdown"""
-        ports = [f"{p.device} - {p.description}" for p in serial.tools.list_ports.comports()]
-        combo.clear()
-        combo.addItems(ports if ports else ["No ports detected"])
+    def _refresh_ports(self):
+        """Rescan COM ports in the background"""
+        self.port_scanner.refresh(force=True)
+    
+    def _on_ports_updated(self, ports):
+        """Refresh COM port dropdowns with scan results"""
+        for combo in self._port_combos:
+            populate_port_combo(combo, ports)
+    
+    def _on_click_connect(self, drone_id, *_):
+        """Read the selected port/baud only when Connect is clicked"""
+        widgets = self._widgets[drone_id]
+        self._on_connect(drone_id, widgets["port"].currentText(), int(widgets["baud"].currentText()))
     
     def _on_connect(self, drone_id, port_text, baud):
         """Handle connect button"""
@@ -242,59 +301,54 @@ class ConnectionSidebar(QWidget):
         self.connect_requested.emit(drone_id, port, baud)
         
         # Update UI
-        connect_btn = self.findChild(QPushButton, f"{drone_id}_connect")
-        disconnect_btn = self.findChild(QPushButton, f"{drone_id}_disconnect")
-        status_lbl = self.findChild(QLabel, f"{drone_id}_status")
-        
-        if connect_btn:
-            connect_btn.setEnabled(False)
-        if disconnect_btn:
-            disconnect_btn.setEnabled(True)
-        if status_lbl:
-            status_lbl.setText("● Connecting...")
-            status_lbl.setStyleSheet("color: #ffa500; font-size: 9pt;")
+        widgets = self._widgets[drone_id]
+        widgets["connect"].setEnabled(False)
+        widgets["disconnect"].setEnabled(True)
+        widgets["status"].setText("● Connecting...")
+        set_style_property(widgets["status"], "state", "connecting")
+        self._last_connected.pop(drone_id, None)
     
-    def _on_disconnect(self, drone_id):
+    def _on_disconnect(self, drone_id, *_):
         """Handle disconnect button"""
         self.disconnect_requested.emit(drone_id)
         
         # Update UI
-        connect_btn = self.findChild(QPushButton, f"{drone_id}_connect")
-        disconnect_btn = self.findChild(QPushButton, f"{drone_id}_disconnect")
-        status_lbl = self.findChild(QLabel, f"{drone_id}_status")
-        
-        if connect_btn:
-            connect_btn.setEnabled(True)
-        if disconnect_btn:
-            disconnect_btn.setEnabled(False)
-        if status_lbl:
-            status_lbl.setText("● Disconnected")
-            status_lbl.setStyleSheet("color: #ff3333; font-size: 9pt;")
+        widgets = self._widgets[drone_id]
+        widgets["connect"].setEnabled(True)
+        widgets["disconnect"].setEnabled(False)
+        widgets["status"].setText("● Disconnected")
+        set_style_property(widgets["status"], "state", "disconnected")
+        self._last_connected[drone_id] = False
     
     def update_connection_status(self, drone_id, connected):
         """Update connection status display"""
-        status_lbl = self.findChild(QLabel, f"{drone_id}_status")
-        if status_lbl:
+        widgets = self._widgets.get(drone_id)
+        if widgets and self._last_connected.get(drone_id) != connected:
+            self._last_connected[drone_id] = connected
+            status_lbl = widgets["status"]
             if connected:
                 status_lbl.setText("● Connected")
-                status_lbl.setStyleSheet("color: #00ff88; font-size: 9pt;")
+                set_style_property(status_lbl, "state", "connected")
             else:
                 status_lbl.setText("● Disconnected")
-                status_lbl.setStyleSheet("color: #ff3333; font-size: 9pt;")
+                set_style_property(status_lbl, "state", "disconnected")
         
         # Update system status
-        drone1_connected = self.drone_manager.get_drone("drone_1").connected if self.drone_manager.get_drone("drone_1") else False
-        drone2_connected = self.drone_manager.get_drone("drone_2").connected if self.drone_manager.get_drone("drone_2") else False
+        drone1_connected = self.drone1.connected if self.drone1 else False
+        drone2_connected = self.drone2.connected if self.drone2 else False
         
         count = (1 if drone1_connected else 0) + (1 if drone2_connected else 0)
+        if count == self._last_count:
+            return
+        self._last_count = count
         self.lbl_connected.setText(f"Connected: {count}/2")
         
         if count == 2:
             self.lbl_status.setText("● All Systems Active")
-            self.lbl_status.setStyleSheet("color: #00ff88; font-size: 10pt; font-weight: bold;")
+            set_style_property(self.lbl_status, "state", "active")
         elif count == 1:
             self.lbl_status.setText("● Partial Connection")
-            self.lbl_status.setStyleSheet("color: #ffa500; font-size: 10pt; font-weight: bold;")
+            set_style_property(self.lbl_status, "state", "partial")
         else:
             self.lbl_status.setText("● Ready")
-            self.lbl_status.setStyleSheet("color: #9ca3af; font-size: 10pt; font-weight: bold;")
+            set_style_property(self.lbl_status, "state", "ready")
@@ -4,8 +4,10 @@ Manages multiple simultaneous drone connections for v2.0
 """
 
 import logging
+import sys
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Callable, Dict, List, Optional, Tuple
 from PyQt5.QtCore import QObject, pyqtSignal
 from mavlink_worker import MavlinkWorker
 
@@ -14,8 +16,43 @@ try:
 except ImportError:
     get_logger = logging.getLogger
 
+# Slotted dataclasses need Python 3.10+; older interpreters keep the instance __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+# MavlinkWorker methods reachable through send_command
+WORKER_COMMANDS = ("connect", "disconnect", "arm_disarm", "force_arm", "set_mode", "mission_start", "abort_land")
+
+# Default telemetry for a new drone; channels are copied per drone in __post_init__
+TELEMETRY_TEMPLATE = MappingProxyType({
+    'attitude': MappingProxyType({'roll': 0, 'pitch': 0, 'yaw': 0}),
+    'position': MappingProxyType({'lat': 0, 'lon': 0, 'alt': 0}),
+    'gps': MappingProxyType({'fix_type': 0, 'satellites': 0, 'hdop': 0, 'vdop': 0}),
+    'battery': MappingProxyType({'voltage': 0, 'current': 0, 'remaining': -1}),
+    'flight_mode': 'Unknown',
+    'last_update': 0,
+})
+
+# Text messages are always forwarded, even when repeated verbatim
+DEDUP_EXEMPT_TYPES = frozenset({'status_message', 'error_message', 'fcu_statustext'})
+
+# Attitude is hashed at ~0.06 degree resolution so sensor jitter does not count as a change
+ATTITUDE_HASH_DECIMALS = 3
+
+
+def _payload_hash(msg_type: str, data: dict) -> int:
+    """Hash telemetry payload values, ignoring the per-message timestamp"""
+    if msg_type == 'attitude':
+        return hash(tuple((k, round(v, ATTITUDE_HASH_DECIMALS) if isinstance(v, float) else v)
+                          for k, v in data.items() if k != 'timestamp'))
+    return hash(tuple((k, v) for k, v in data.items() if k != 'timestamp'))
+
+
+class DroneSignals(QObject):
+    """Signals scoped to a single drone, so receivers aren't invoked for other drones"""
+    telemetry_batch = pyqtSignal(list)  # [(msg_type, data), ...]
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class DroneConnection:
     """Represents a single drone connection"""
     drone_id: str                    # Unique identifier (e.g., "drone_1", "drone_2")
@@ -27,18 +64,14 @@ class DroneConnection:
     connected: bool = False
     armed: bool = False
     telemetry: Dict = field(default_factory=dict)  # Latest telemetry data
+    _last_hash: Dict[str, int] = field(default_factory=dict, repr=False)  # msg_type -> payload hash
+    commands: Dict[str, Callable] = field(default_factory=dict, repr=False)  # command -> bound worker method
     
     def __post_init__(self):
         """Initialize telemetry with default values"""
         if not self.telemetry:
-            self.telemetry = {
-                'attitude': {'roll': 0, 'pitch': 0, 'yaw': 0},
-                'position': {'lat': 0, 'lon': 0, 'alt': 0},
-                'gps': {'fix_type': 0, 'satellites': 0, 'hdop': 0, 'vdop': 0},
-                'battery': {'voltage': 0, 'current': 0, 'remaining': -1},
-                'flight_mode': 'Unknown',
-                'last_update': 0
-            }
+            self.telemetry = {k: dict(v) if isinstance(v, MappingProxyType) else v
+                              for k, v in TELEMETRY_TEMPLATE.items()}
 
 
 class DroneManager(QObject):
@@ -52,7 +85,6 @@ class DroneManager(QObject):
     drone_removed = pyqtSignal(str)            # drone_id
     drone_connected = pyqtSignal(str)          # drone_id
     drone_disconnected = pyqtSignal(str)       # drone_id
-    drone_telemetry_updated = pyqtSignal(str, str, dict)  # drone_id, msg_type, data
     
     # Default drone colors (auto-assigned)
     DEFAULT_COLORS = [
@@ -68,9 +100,14 @@ class DroneManager(QObject):
         super().__init__()
         self.max_drones = max_drones
         self.drones: Dict[str, DroneConnection] = {}
+        self.drone_signals: Dict[str, DroneSignals] = {}  # drone_id -> per-drone signals
         self.logger = get_logger("drone_manager")
         self._next_drone_number = 1
         
+        # Forget deduplication state on link changes so a fresh link repaints everything
+        self.drone_connected.connect(self._reset_telemetry_hashes)
+        self.drone_disconnected.connect(self._reset_telemetry_hashes)
+        
         self.logger.info(f"DroneManager initialized (max drones: {max_drones})")
     
     def add_drone(self, port: str, baud: int, name: Optional[str] = None) -> Optional[str]:
@@ -112,11 +149,14 @@ class DroneManager(QObject):
             port=port,
             baud=baud,
             worker=worker,
-            color=color
+            color=color,
+            commands={name: getattr(worker, name) for name in WORKER_COMMANDS
+                      if callable(getattr(worker, name, None))}
         )
         
         # Store drone
         self.drones[drone_id] = drone
+        self.drone_signals[drone_id] = DroneSignals()
         
         self.logger.info(f"Added drone: {drone_id} ({name}) on {port} @ {baud} baud - Color: {color}")
         
@@ -150,6 +190,7 @@ class DroneManager(QObject):
         
         # Remove from dict
         del self.drones[drone_id]
+        self.drone_signals.pop(drone_id, None)
         
         self.logger.info(f"Removed drone: {drone_id}")
         
@@ -237,31 +278,64 @@ class DroneManager(QObject):
     def update_telemetry(self, drone_id: str, msg_type: str, data: dict):
         """
         Update telemetry for a specific drone
-        Called by controller after polling worker queues
+        Single-message form of update_telemetry_batch
         
         Args:
             drone_id: Drone identifier
             msg_type: Message type (e.g., 'attitude', 'gps', 'battery')
             data: Telemetry data dict
         """
-        if drone_id not in self.drones:
-            return
-        
-        drone = self.drones[drone_id]
+        self.update_telemetry_batch(drone_id, [(msg_type, data)])
+    
+    def update_telemetry_batch(self, drone_id: str, updates: List[Tuple[str, dict]]):
+        """
+        Merge a tick's worth of telemetry for one drone and notify the UI once
+        Called by controller after polling worker queues
         
-        # Update telemetry storage
-        if msg_type in drone.telemetry:
-            drone.telemetry[msg_type].update(data)
-        else:
-            drone.telemetry[msg_type] = data
+        Args:
+            drone_id: Drone identifier
+            updates: (msg_type, data) pairs in arrival order
+        """
+        drone = self.drones.get(drone_id)
+        if drone is None or not updates:
+            return
         
-        # Update armed status
-        if msg_type == 'status':
-            if 'armed' in data:
+        # Update telemetry storage, dropping payloads identical to the last one
+        telemetry = drone.telemetry
+        last_hash = drone._last_hash
+        changed = []
+        for msg_type, data in updates:
+            if msg_type not in DEDUP_EXEMPT_TYPES:
+                h = _payload_hash(msg_type, data)
+                if last_hash.get(msg_type) == h:
+                    continue
+                last_hash[msg_type] = h
+            changed.append((msg_type, data))
+            
+            if msg_type == 'flight_mode':
+                # Stored as a plain string, as initialized in DroneConnection
+                telemetry['flight_mode'] = data.get('mode', 'Unknown')
+                continue
+            
+            current = telemetry.get(msg_type)
+            if isinstance(current, dict):
+                current.update(data)
+            else:
+                telemetry[msg_type] = data
+            
+            # Update armed status
+            if msg_type == 'status' and 'armed' in data:
                 drone.armed = data['armed']
         
-        # Emit signal for UI update
-        self.drone_telemetry_updated.emit(drone_id, msg_type, data)
+        # One signal for the whole batch, to that drone's receivers only
+        if changed:
+            self.drone_signals[drone_id].telemetry_batch.emit(changed)
+    
+    def _reset_telemetry_hashes(self, drone_id: str):
+        """Clear last-seen payload hashes for a drone"""
+        drone = self.drones.get(drone_id)
+        if drone:
+            drone._last_hash.clear()
     
     def get_telemetry(self, drone_id: str, msg_type: Optional[str] = None) -> Optional[dict]:
         """
@@ -300,8 +374,8 @@ class DroneManager(QObject):
         drone = self.drones[drone_id]
         
         # Call appropriate worker method
-        if hasattr(drone.worker, command):
-            method = getattr(drone.worker, command)
+        method = drone.commands.get(command)
+        if method:
             method(*args, **kwargs)
             self.logger.debug(f"Sent command '{command}' to drone {drone_id}")
         else:
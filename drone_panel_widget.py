@@ -4,9 +4,123 @@ With connection controls and exception handling
 """
 
 import math
-import serial.tools.list_ports
+from types import MappingProxyType
+from typing import Final
 from PyQt5 import QtCore, QtGui, QtWidgets
+from drone_manager import DroneManager
 from hud_widget_reference_style import ReferenceStyleHUDWidget
+from port_scanner import get_port_scanner, populate_port_combo
+from style_utils import qss_rules
+from telemetry_text import fmt_amp, fmt_angle, fmt_coord, fmt_volt, set_label_texts
+
+MESSAGE_LOG_MAX_BLOCKS = 200  # Oldest lines are dropped past this
+LABEL_FLUSH_INTERVAL_MS = 100  # Telemetry labels refresh at up to 10 Hz
+MESSAGE_FLUSH_INTERVAL_MS = 50  # Messages arriving within this window share one append
+
+# ArduCopter flight modes (combo order) and the reverse lookup for incoming ids
+MODE_BY_NAME: Final = MappingProxyType({
+    "Stabilize": 0, "Alt Hold": 2, "Loiter": 5, "Auto": 3, "Guided": 4, "RTL": 6, "Land": 9,
+})
+MODE_BY_ID: Final = MappingProxyType({v: k for k, v in MODE_BY_NAME.items()})
+MODE_NAMES: Final = tuple(MODE_BY_NAME)
+
+# GPS_RAW_INT fix_type names, indexed by fix_type
+GPS_FIX_NAMES: Final = ("No GPS", "No Fix", "2D", "3D", "DGPS", "RTK Float", "RTK Fixed")
+
+RAD_TO_DEG = 180.0 / math.pi
+
+# One stylesheet string for every panel; group box colours are selected by the
+# panel's droneColor property instead of formatting a stylesheet per instance
+PANEL_STYLESHEET = """
+    QWidget {
+        background-color: #2a2a2a;
+        color: #ffffff;
+        font-family: Arial, sans-serif;
+        font-size: 9pt;
+    }
+    QGroupBox {
+        font-weight: bold;
+        border: 2px solid #555555;
+        border-radius: 5px;
+        margin-top: 1ex;
+        padding-top: 10px;
+        background-color: #333333;
+    }
+    QGroupBox::title {
+        subcontrolorigin: margin;
+        subcontrol-position: top center;
+        padding: 0 8px;
+    }
+    QPushButton {
+        background-color: #0078d4;
+        border: 1px solid #005a9e;
+        padding: 6px 12px;
+        border-radius: 4px;
+        font-weight: bold;
+        color: white;
+    }
+    QPushButton:hover { background-color: #1084d8; }
+    QPushButton:pressed { background-color: #005a9e; }
+    QPushButton:disabled { background-color: #404040; color: #808080; }
+    QComboBox {
+        background-color: #404040;
+        border: 1px solid #555555;
+        padding: 4px 8px;
+        border-radius: 4px;
+    }
+    QPlainTextEdit {
+        background-color: #1a1a1a;
+        border: 1px solid #404040;
+        border-radius: 4px;
+        padding: 8px;
+        font-family: Consolas, monospace;
+        font-size: 9pt;
+    }
+""" + qss_rules("""
+    DronePanelWidget[droneColor="{0}"] QGroupBox {{
+        border: 2px solid {0};
+    }}
+    DronePanelWidget[droneColor="{0}"] QGroupBox::title {{
+        color: {0};
+    }}""", DroneManager.DEFAULT_COLORS)
+
+
+def _fmt_repeated(msg, count):
+    """Message log line, with the repeat count once a message arrives again"""
+    return f"{msg} (x{count})" if count > 1 else msg
+
+
+class _LabelFlusher(QtCore.QObject):
+    """Single timer that applies queued label text for every drone panel"""
+    
+    def __init__(self):
+        super().__init__()
+        self._dirty_panels = set()
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(LABEL_FLUSH_INTERVAL_MS)
+        self._timer.timeout.connect(self._flush)
+    
+    def schedule(self, panel):
+        self._dirty_panels.add(panel)
+        if not self._timer.isActive():
+            self._timer.start()
+    
+    def _flush(self):
+        panels, self._dirty_panels = self._dirty_panels, set()
+        for panel in panels:
+            panel._flush_labels()
+
+
+_label_flusher = None
+
+
+def _get_label_flusher() -> _LabelFlusher:
+    """Get the shared label flusher (create from the GUI thread)"""
+    global _label_flusher
+    if _label_flusher is None:
+        _label_flusher = _LabelFlusher()
+    return _label_flusher
 
 
 class DronePanelWidget(QtWidgets.QWidget):
@@ -21,62 +135,73 @@ class DronePanelWidget(QtWidgets.QWidget):
         self.drone_color = drone.color if drone else "#FF0000"
         self.drone_name = drone.name if drone else "Unknown"
         
+        # Telemetry labels are written at most every LABEL_FLUSH_INTERVAL_MS,
+        # by one timer shared across all panels
+        self._label_text = {}   # QLabel -> last applied text
+        self._label_dirty = {}  # QLabel -> pending text
+        self._pending_groups = {}  # msg_type -> latest payload, formatted at flush time
+        self._last_mode = None      # Last flight mode shown
+        
+        # The HUD is shared between panels and moved into whichever one is shown.
+        # Each panel keeps the latest HUD payload per message type to rehydrate it
+        self.hud = None        # Window's shared HUD while it sits in this panel's slot
+        self._hud_state = {}   # msg_type -> latest payload
+        self._hud_updaters = {
+            "attitude": self._hud_attitude,
+            "vfr_hud": self._hud_vfr,
+            "gps": self._hud_gps,
+            "sys_status": self._hud_status,
+        }
+        self._label_flusher = _get_label_flusher()
+        
+        # Messages queued within MESSAGE_FLUSH_INTERVAL_MS are inserted together
+        self._pending_msgs = []
+        self._last_msg = None    # Message on the log's last line
+        self._repeat_count = 1   # Times _last_msg has been received in a row
+        self._msg_flush_timer = QtCore.QTimer(self)
+        self._msg_flush_timer.setSingleShot(True)
+        self._msg_flush_timer.setInterval(MESSAGE_FLUSH_INTERVAL_MS)
+        self._msg_flush_timer.timeout.connect(self._flush_messages)
+        
         self._setup_ui()
         
+        # Telemetry dispatch: msg_type -> handler(data)
+        self._telemetry_handlers = {
+            "attitude": self._update_attitude,
+            "vfr_hud": self._update_vfr,
+            "gps": self._update_gps,
+            "sys_status": self._update_status,
+            "flight_mode": self._on_flight_mode,
+            "statustext": self._on_statustext,
+            "fcu_statustext": self._on_statustext,
+            "status_message": self._on_status_message,
+            "error_message": self._on_error_message,
+        }
+        
+        # Label formatters for _pending_groups: msg_type -> fn(data) -> ((QLabel, text), ...)
+        self._label_formatters = {
+            "attitude": self._attitude_labels,
+            "vfr_hud": self._vfr_labels,
+            "gps": self._gps_labels,
+            "sys_status": self._status_labels,
+        }
+        
         # Connect signals
-        self.drone_manager.drone_telemetry_updated.connect(self._on_telemetry_update)
+        # Batches are emitted from the controller tick on the GUI thread, so call the slot directly.
+        # Only this drone's signal is subscribed; other drones' batches never reach the panel
+        drone_signals = self.drone_manager.drone_signals.get(drone_id)
+        if drone_signals:
+            drone_signals.telemetry_batch.connect(self._on_telemetry_batch, QtCore.Qt.DirectConnection)
         self.drone_manager.drone_connected.connect(self._on_connection_changed)
         self.drone_manager.drone_disconnected.connect(self._on_connection_changed)
+        self.port_scanner.ports_updated.connect(self._on_ports_updated)
+        self.port_scanner.refresh()
         
     def _setup_ui(self):
         """Create UI"""
-        self.setStyleSheet(f"""
-            QWidget {{
-                background-color: #2a2a2a;
-                color: #ffffff;
-                font-family: Arial, sans-serif;
-                font-size: 9pt;
-            }}
-            QGroupBox {{
-                font-weight: bold;
-                border: 2px solid {self.drone_color};
-                border-radius: 5px;
-                margin-top: 1ex;
-                padding-top: 10px;
-                background-color: #333333;
-            }}
-            QGroupBox::title {{
-                subcontrolorigin: margin;
-                subcontrol-position: top center;
-                padding: 0 8px;
-                color: {self.drone_color};
-            }}
-            QPushButton {{
-                background-color: #0078d4;
-                border: 1px solid #005a9e;
-                padding: 6px 12px;
-                border-radius: 4px;
-                font-weight: bold;
-                color: white;
-            }}
-            QPushButton:hover {{ background-color: #1084d8; }}
-            QPushButton:pressed {{ background-color: #005a9e; }}
-            QPushButton:disabled {{ background-color: #404040; color: #808080; }}
-            QComboBox {{
-                background-color: #404040;
-                border: 1px solid #555555;
-                padding: 4px 8px;
-                border-radius: 4px;
-            }}
-            QTextEdit {{
-                background-color: #1a1a1a;
-                border: 1px solid #404040;
-                border-radius: 4px;
-                padding: 8px;
-                font-family: Consolas, monospace;
-                font-size: 9pt;
-            }}
-        """)
+        # Shared stylesheet; the drone colour is picked by the droneColor property
+        self.setProperty("droneColor", self.drone_color)
+        self.setStyleSheet(PANEL_STYLESHEET)
         
         main_layout = QtWidgets.QVBoxLayout(self)
         
@@ -88,10 +213,11 @@ class DronePanelWidget(QtWidgets.QWidget):
         # Content split: HUD | Panels
         content_layout = QtWidgets.QHBoxLayout()
         
-        # Left: HUD
-        self.hud = ReferenceStyleHUDWidget(self)
-        self.hud.setFixedSize(400, 350)
-        content_layout.addWidget(self.hud)
+        # Left: HUD (slot only; the window places its shared HUD here, see attach_hud)
+        self._hud_slot = QtWidgets.QWidget()
+        self._hud_slot.setFixedSize(400, 350)
+        QtWidgets.QVBoxLayout(self._hud_slot).setContentsMargins(0, 0, 0, 0)
+        content_layout.addWidget(self._hud_slot)
         
         # Right: Telemetry + Controls
         right_panel = QtWidgets.QWidget()
@@ -125,9 +251,12 @@ class DronePanelWidget(QtWidgets.QWidget):
         # Messages
         msg_box = QtWidgets.QGroupBox("Messages")
         msg_layout = QtWidgets.QVBoxLayout(msg_box)
-        self.message_area = QtWidgets.QTextEdit()
+        # Plain text: no rich-text layout, and FCU text is never parsed as HTML
+        self.message_area = QtWidgets.QPlainTextEdit()
         self.message_area.setReadOnly(True)
+        self.message_area.setUndoRedoEnabled(False)
         self.message_area.setMaximumHeight(100)
+        self.message_area.setMaximumBlockCount(MESSAGE_LOG_MAX_BLOCKS)
         msg_layout.addWidget(self.message_area)
         main_layout.addWidget(msg_box)
         
@@ -161,7 +290,9 @@ class DronePanelWidget(QtWidgets.QWidget):
         layout.addWidget(self.btn_connect, 2, 0, 1, 2)
         layout.addWidget(self.btn_disconnect, 2, 2)
         
-        self._refresh_ports()
+        # Start from the cached port list; the background scan fills in the rest
+        self.port_scanner = get_port_scanner()
+        populate_port_combo(self.combo_port, self.port_scanner.cached_ports())
         return box
     
     def _create_telemetry_groupbox(self, title, labels):
@@ -185,7 +316,7 @@ class DronePanelWidget(QtWidgets.QWidget):
         self.btn_arm.clicked.connect(self._on_arm_disarm)
         
         self.combo_modes = QtWidgets.QComboBox()
-        self.combo_modes.addItems(["Stabilize", "Alt Hold", "Loiter", "Auto", "Guided", "RTL", "Land"])
+        self.combo_modes.addItems(MODE_NAMES)
         
         self.btn_set_mode = QtWidgets.QPushButton("Set Mode")
         self.btn_set_mode.clicked.connect(self._on_set_mode)
@@ -198,10 +329,12 @@ class DronePanelWidget(QtWidgets.QWidget):
     
     # Connection handlers
     def _refresh_ports(self):
-        """Refresh COM ports"""
-        ports = [f"{p.device} - {p.description}" for p in serial.tools.list_ports.comports()]
-        self.combo_port.clear()
-        self.combo_port.addItems(ports if ports else ["No ports detected"])
+        """Rescan COM ports in the background"""
+        self.port_scanner.refresh(force=True)
+    
+    def _on_ports_updated(self, ports):
+        """Refresh COM port dropdown with scan results"""
+        populate_port_combo(self.combo_port, ports)
     
     def _on_connect(self):
         """Connect to drone"""
@@ -252,77 +385,185 @@ class DronePanelWidget(QtWidgets.QWidget):
         if not self._check_connection():
             return
         mode = self.combo_modes.currentText()
-        modes = {"Stabilize": 0, "Alt Hold": 2, "Loiter": 5, "RTL": 6, "Land": 9, "Auto": 3, "Guided": 4}
-        if mode in modes:
-            self.drone_manager.send_command(self.drone_id, 'set_mode', modes[mode])
+        mode_id = MODE_BY_NAME.get(mode)
+        if mode_id is not None:
+            self.drone_manager.send_command(self.drone_id, 'set_mode', mode_id)
             self.append_message(f"Setting mode to {mode}...")
     
     # Telemetry updates
-    def _on_telemetry_update(self, drone_id, msg_type, data):
-        if drone_id != self.drone_id:
-            return
-        
-        if msg_type == "attitude":
-            self._update_attitude(data)
-        elif msg_type == "vfr_hud":
-            self._update_vfr(data)
-        elif msg_type == "gps":
-            self._update_gps(data)
-        elif msg_type == "sys_status":
-            self._update_status(data)
-        elif msg_type == "flight_mode":
-            self._update_flight_mode(data)
-        elif msg_type == "statustext":
-            self.append_message(f"FCU: {data}")
-        elif msg_type == "status_message":
-            # Connection status message
-            self.append_message(data.get('text', ''))
-        elif msg_type == "error_message":
-            # Error message
-            self.append_message(f"ERROR: {data.get('text', '')}")
+    def _on_telemetry_batch(self, updates):
+        handlers = self._telemetry_handlers
+        for msg_type, data in updates:
+            handler = handlers.get(msg_type)
+            if handler:
+                handler(data)
+    
+    def _on_flight_mode(self, data):
+        self._update_flight_mode(data.get('mode', ''))
+    
+    def _on_statustext(self, data):
+        # FCU status text (stored as {'text': ...} by the controller)
+        text = data.get('text', '') if isinstance(data, dict) else data
+        self.append_message(f"FCU: {text}")
+    
+    def _on_status_message(self, data):
+        # Connection status message
+        self.append_message(data.get('text', ''))
+    
+    def _on_error_message(self, data):
+        self.append_message(f"ERROR: {data.get('text', '')}")
     
     def _update_attitude(self, data):
-        # Update HUD with raw values (radians)
-        self.hud.update_attitude(data.get('roll', 0), data.get('pitch', 0), data.get('yaw', 0))
-        # Display roll and pitch in degrees
-        self.lbl_roll.setText(f"{math.degrees(data.get('roll', 0)):.1f}°")
-        self.lbl_pitch.setText(f"{math.degrees(data.get('pitch', 0)):.1f}°")
-        # Note: yaw label will be updated by _update_vfr with heading from VFR_HUD
+        self._update_hud('attitude', data)
+        self._queue_labels('attitude', data)
     
     def _update_vfr(self, data):
+        self._update_hud('vfr_hud', data)
+        self._queue_labels('vfr_hud', data)
+    
+    def _live_hud(self):
+        """The HUD if it is in this panel and on screen, else None"""
+        hud = self.hud
+        return hud if hud is not None and self.isVisible() else None
+    
+    def _update_hud(self, msg_type, data):
+        """Record a HUD payload and apply it if the HUD is on screen in this panel"""
+        self._hud_state[msg_type] = data
+        hud = self._live_hud()
+        if hud:
+            self._hud_updaters[msg_type](hud, data)
+    
+    def _hud_attitude(self, hud, data):
+        # Update HUD with raw values (radians)
+        get = data.get
+        hud.update_attitude(get('roll', 0), get('pitch', 0), get('yaw', 0))
+    
+    def _hud_vfr(self, hud, data):
         # VFR_HUD heading is already in degrees from flight controller
-        heading = data.get('heading', 0)
-        self.hud.update_vfr(heading, data.get('airspeed', 0), 
-                           data.get('groundspeed', 0), data.get('alt', 0))
-        # Update yaw label with heading from VFR_HUD (degrees, direct from FC)
-        self.lbl_yaw.setText(f"{int(heading)}°")
+        get = data.get
+        hud.update_vfr(get('heading', 0), get('airspeed', 0), get('groundspeed', 0), get('alt', 0))
+    
+    def _hud_gps(self, hud, data):
+        hud.update_gps(data.get('fix_type', 0), data.get('satellites', 0))
+    
+    def _hud_status(self, hud, data):
+        hud.update_battery(data.get('remaining', -1))
+    
+    def attach_hud(self, hud: ReferenceStyleHUDWidget):
+        """Place the window's shared HUD in this panel's slot and show this drone's state"""
+        self._hud_slot.layout().addWidget(hud)
+        hud.show()
+        self.hud = hud
+        if self.isVisible():
+            self._sync_hud()
+    
+    def detach_hud(self):
+        """Stop driving the shared HUD (another panel's tab has taken it)"""
+        self.hud = None
+    
+    def _sync_hud(self):
+        """Rehydrate the HUD with this drone's state"""
+        hud = self.hud
+        hud.reset_data_validity()
+        hud.update_flight_mode(self._last_mode or "Unknown")
+        drone = self.drone_manager.get_drone(self.drone_id)
+        if drone:
+            hud.update_connection_status(drone.connected)
+            hud.update_armed_status(drone.armed)
+        updaters = self._hud_updaters
+        for msg_type, data in self._hud_state.items():
+            updaters[msg_type](hud, data)
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.hud is not None:
+            self._sync_hud()
+        self._flush_labels()
+    
+    def _attitude_labels(self, data):
+        # Display roll and pitch in degrees
+        # Note: yaw label is updated from VFR_HUD heading
+        get = data.get
+        return ((self.lbl_roll, fmt_angle(get('roll', 0) * RAD_TO_DEG)),
+                (self.lbl_pitch, fmt_angle(get('pitch', 0) * RAD_TO_DEG)))
+    
+    def _vfr_labels(self, data):
+        # Yaw label shows heading from VFR_HUD (degrees, direct from FC)
+        return ((self.lbl_yaw, f"{int(data.get('heading', 0))}°"),)
+    
+    def _gps_labels(self, data):
+        get = data.get
+        fix_type = get('fix_type', 0)
+        fix_name = GPS_FIX_NAMES[fix_type] if 0 <= fix_type < len(GPS_FIX_NAMES) else "Unknown"
+        return ((self.lbl_gps_fix, fix_name),
+                (self.lbl_gps_sats, str(get('satellites', 0))),
+                (self.lbl_gps_lat, fmt_coord(get('lat', 0))),
+                (self.lbl_gps_lon, fmt_coord(get('lon', 0))))
+    
+    def _status_labels(self, data):
+        get = data.get
+        rem = get('remaining', -1)
+        return ((self.lbl_status_volt, fmt_volt(get('voltage', 0))),
+                (self.lbl_status_curr, fmt_amp(get('current', 0))),
+                (self.lbl_status_rem, f"{rem}%" if rem >= 0 else "N/A"))
+    
+    def _queue_labels(self, msg_type, data):
+        """Keep the latest payload for a label group; only that one is formatted at flush"""
+        if not self._label_dirty and not self._pending_groups:
+            self._label_flusher.schedule(self)
+        self._pending_groups[msg_type] = data
+    
+    def _set_label_text(self, label, text):
+        """Queue a label update; applied by the next label flush"""
+        if not self._label_dirty and not self._pending_groups:
+            self._label_flusher.schedule(self)
+        self._label_dirty[label] = text
+    
+    def _flush_labels(self):
+        """Apply queued label text, calling setText only for changed values"""
+        if not self.isVisible():
+            # Keep the queued payloads (latest per group); showEvent flushes them.
+            # Nothing reschedules the flusher until then.
+            return
+        
+        dirty = self._label_dirty
+        pending, self._pending_groups = self._pending_groups, {}
+        formatters = self._label_formatters
+        for msg_type, data in pending.items():
+            dirty.update(formatters[msg_type](data))
+        
+        set_label_texts(self, self._label_text, dirty.items())
+        dirty.clear()
     
     def _update_gps(self, data):
-        fix_map = {0: "No GPS", 1: "No Fix", 2: "2D", 3: "3D", 4: "DGPS", 5: "RTK"}
-        self.lbl_gps_fix.setText(fix_map.get(data.get('fix_type', 0), "Unknown"))
-        self.lbl_gps_sats.setText(str(data.get('satellites', 0)))
-        self.lbl_gps_lat.setText(f"{data.get('lat', 0):.6f}")
-        self.lbl_gps_lon.setText(f"{data.get('lon', 0):.6f}")
-        self.hud.update_gps(data.get('fix_type', 0), data.get('satellites', 0))
+        self._update_hud('gps', data)
+        self._queue_labels('gps', data)
     
     def _update_status(self, data):
-        self.lbl_status_volt.setText(f"{data.get('voltage', 0):.1f}V")
-        self.lbl_status_curr.setText(f"{data.get('current', 0):.1f}A")
-        rem = data.get('remaining', -1)
-        self.lbl_status_rem.setText(f"{rem}%" if rem >= 0 else "N/A")
-        self.hud.update_battery(rem)
+        self._update_hud('sys_status', data)
+        self._queue_labels('sys_status', data)
     
     def _update_flight_mode(self, mode):
-        self.lbl_mode.setText(mode)
-        self.hud.update_flight_mode(mode)
+        if isinstance(mode, int):
+            mode = MODE_BY_ID.get(mode, str(mode))
+        if mode == self._last_mode:
+            return
+        self._last_mode = mode
+        hud = self._live_hud()
+        if hud:
+            hud.update_flight_mode(mode)
+        self._set_label_text(self.lbl_mode, mode)
     
     def _on_connection_changed(self, drone_id):
         if drone_id != self.drone_id:
             return
         drone = self.drone_manager.get_drone(drone_id)
         if drone:
-            self.hud.update_connection_status(drone.connected)
-            self.hud.update_armed_status(drone.armed)
+            # A hidden panel's HUD is brought up to date by _sync_hud on show
+            hud = self._live_hud()
+            if hud:
+                hud.update_connection_status(drone.connected)
+                hud.update_armed_status(drone.armed)
             
             # Sync button states globally
             if drone.connected:
@@ -333,8 +574,38 @@ class DronePanelWidget(QtWidgets.QWidget):
                 self.btn_connect.setEnabled(True)
                 self.btn_disconnect.setEnabled(False)
                 self.append_message("✗ Disconnected")
-                # Reset HUD data validity when disconnected
-                self.hud.reset_data_validity()
+                # Reset HUD data validity when disconnected; forget stale payloads
+                self._hud_state.clear()
+                if hud:
+                    hud.reset_data_validity()
     
     def append_message(self, msg):
-        self.message_area.append(msg)
+        self._pending_msgs.append(msg)
+        if not self._msg_flush_timer.isActive():
+            self._msg_flush_timer.start()
+    
+    def _flush_messages(self):
+        """Insert queued messages with a single plain-text append, collapsing repeats"""
+        pending, self._pending_msgs = self._pending_msgs, []
+        last_count = self._repeat_count
+        entries = []  # [msg, count] for lines not yet in the log
+        for msg in pending:
+            if entries:
+                if entries[-1][0] == msg:
+                    entries[-1][1] += 1
+                    continue
+            elif msg == self._last_msg:
+                last_count += 1
+                continue
+            entries.append([msg, 1])
+        
+        if last_count != self._repeat_count:
+            # Repeats of the log's last line: rewrite it in place with the new count
+            cursor = QtGui.QTextCursor(self.message_area.document())
+            cursor.movePosition(QtGui.QTextCursor.End)
+            cursor.movePosition(QtGui.QTextCursor.StartOfBlock, QtGui.QTextCursor.KeepAnchor)
+            cursor.insertText(_fmt_repeated(self._last_msg, last_count))
+            self._repeat_count = last_count
+        if entries:
+            self.message_area.appendPlainText("\n".join(_fmt_repeated(msg, count) for msg, count in entries))
+            self._last_msg, self._repeat_count = entries[-1]
@@ -3,9 +3,132 @@ ASRA GCS - Drone Status Card Widget (Refined)
 Properly measured, aligned, no overlapping, text fits boxes
 """
 
+from functools import lru_cache
 from PyQt5 import QtCore, QtWidgets, QtGui
 from PyQt5.QtCore import Qt
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QPushButton
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QGridLayout, QLabel, QPushButton
+from style_utils import qss_rules, set_style_property
+
+
+# Colours a stat value can take
+STAT_COLORS = ("#00ff88", "#ffa500", "#ff3333", "#00d4ff")
+
+# Card rules that don't depend on the drone colour. Widgets are addressed by
+# objectName; armed/colour changes switch dynamic properties (see style_utils.set_style_property)
+CARD_STYLESHEET = """
+    QLabel#cardName {
+        color: white;
+        font-size: 10pt;
+        font-weight: bold;
+    }
+    QLabel#armedBadge {
+        border-radius: 3px;
+        padding: 2px 6px;
+        font-size: 8pt;
+        font-weight: bold;
+        font-family: 'Consolas', monospace;
+    }
+    QLabel#armedBadge[state="armed"] {
+        background-color: #00ff8830;
+        color: #00ff88;
+        border: 1px solid #00ff8880;
+    }
+    QLabel#armedBadge[state="disarmed"] {
+        background-color: #404040;
+        color: #9ca3af;
+        border: 1px solid #555555;
+    }
+    QWidget#tile {
+        background-color: #0a0a0a;
+        border-radius: 3px;
+    }
+    QLabel#statValue {
+        font-size: 8pt;
+        font-weight: bold;
+        font-family: 'Consolas', monospace;
+    }
+    QLabel#flightLabel {
+        font-size: 7pt;
+        color: #9ca3af;
+        font-family: 'Consolas', monospace;
+    }
+    QLabel#flightValue {
+        font-size: 10pt;
+        font-weight: bold;
+        color: white;
+        font-family: 'Consolas', monospace;
+    }
+    QPushButton#armButton {
+        border-radius: 4px;
+        font-size: 12pt;
+    }
+    QPushButton#armButton[state="disarmed"] {
+        background-color: #00ff8830;
+        color: #00ff88;
+        border: 1px solid #00ff8880;
+    }
+    QPushButton#armButton[state="disarmed"]:hover { background-color: #00ff8850; }
+    QPushButton#armButton[state="disarmed"]:pressed { background-color: #00ff8820; }
+    QPushButton#armButton[state="armed"] {
+        background-color: #ff333330;
+        color: #ff3333;
+        border: 1px solid #ff333380;
+    }
+    QPushButton#armButton[state="armed"]:hover { background-color: #ff333350; }
+""" + qss_rules("""
+    QLabel#statValue[valueColor="{0}"] {{
+        color: {0};
+    }}""", STAT_COLORS)
+
+
+@lru_cache(maxsize=None)
+def _card_stylesheet(color):
+    """Complete card stylesheet for a drone colour, built once per colour"""
+    return f"""
+    DroneStatusCard {{
+        background-color: #1a1a1a;
+        border: 2px solid {color}40;
+        border-radius: 6px;
+    }}
+    QLabel#modeBadge {{
+        background-color: {color}30;
+        color: {color};
+        border: 1px solid {color}80;
+        border-radius: 4px;
+        padding: 4px 8px;
+        font-size: 9pt;
+        font-weight: bold;
+        font-family: 'Consolas', monospace;
+    }}""" + CARD_STYLESHEET
+
+
+CARD_UPDATE_INTERVAL_MS = 33  # Card refreshes at up to ~30 Hz, whatever the caller's rate
+
+ICON_SIZE = (24, 16)  # Stat icon pixmap size (logical pixels)
+
+# Emoji glyphs rasterized once: (icon, colour) -> QPixmap
+_ICON_CACHE = {}
+
+
+def _icon_pixmap(icon, color):
+    """Render an emoji icon once so cards blit a pixmap instead of shaping the glyph"""
+    key = (icon, color)
+    pixmap = _ICON_CACHE.get(key)
+    if pixmap is None:
+        ratio = QtWidgets.QApplication.instance().devicePixelRatio()
+        width, height = ICON_SIZE
+        pixmap = QtGui.QPixmap(int(width * ratio), int(height * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
+        painter = QtGui.QPainter(pixmap)
+        font = painter.font()
+        font.setPointSize(11)
+        painter.setFont(font)
+        painter.setPen(QtGui.QColor(color))
+        painter.drawText(QtCore.QRectF(0, 0, width, height), Qt.AlignCenter, icon)
+        painter.end()
+        _ICON_CACHE[key] = pixmap
+    return pixmap
 
 
 class DroneStatusCard(QWidget):
@@ -24,6 +147,20 @@ class DroneStatusCard(QWidget):
         drone = drone_manager.get_drone(drone_id)
         self.drone_name = drone.name if drone else "Unknown"
         
+        # Last applied text/colour per label, so steady telemetry doesn't re-layout
+        self._label_text = {}
+        self._label_color = {}
+        self._armed_shown = False  # Card starts in the DISARMED style
+        self._batching = False     # Updates suspended within _apply_status
+        self._pending = None       # Latest telemetry not yet applied
+        self._last_values = None   # Raw values behind the displayed text
+        
+        # update_status only records telemetry; this timer applies the latest one
+        self._status_timer = QtCore.QTimer(self)
+        self._status_timer.setSingleShot(True)
+        self._status_timer.setInterval(CARD_UPDATE_INTERVAL_MS)
+        self._status_timer.timeout.connect(self._apply_status)
+        
         # Set fixed/minimum size for predictable layout
         self.setMinimumWidth(260)
         self.setMaximumWidth(320)
@@ -32,168 +169,105 @@ class DroneStatusCard(QWidget):
         
     def _setup_ui(self):
         """Create UI with precise measurements"""
-        layout = QVBoxLayout(self)
+        # Single grid: 12 columns so four stats span 3 and three flight tiles span 4
+        layout = QGridLayout(self)
         layout.setContentsMargins(10, 10, 10, 10)
-        layout.setSpacing(8)
-        
-        self.setStyleSheet(f"""
-            DroneStatusCard {{
-                background-color: #1a1a1a;
-                border: 2px solid {self.drone_color}40;
-                border-radius: 6px;
-            }}
-        """)
-        
-        # Header: Name + Armed badge (fixed height: 24px)
-        header = QHBoxLayout()
-        header.setSpacing(8)
-        header.setContentsMargins(0, 0, 0, 0)
-        
-        # Left: Color dot + Name
-        name_layout = QHBoxLayout()
-        name_layout.setSpacing(6)
-        name_layout.setContentsMargins(0, 0, 0, 0)
-        
-        color_dot = QLabel()
-        color_dot.setFixedSize(10, 10)
-        color_dot.setStyleSheet(f"background-color: {self.drone_color}; border-radius: 5px;")
-        
-        self.lbl_name = QLabel(self.drone_name)
-        self.lbl_name.setStyleSheet("color: white; font-size: 10pt; font-weight: bold;")
-        self.lbl_name.setFixedHeight(20)
+        layout.setHorizontalSpacing(4)
+        layout.setVerticalSpacing(8)
+        for column in range(12):
+            layout.setColumnStretch(column, 1)
+        
+        # One stylesheet for the whole card; child widgets are styled by objectName
+        self.setStyleSheet(_card_stylesheet(self.drone_color))
         
-        name_layout.addWidget(color_dot)
-        name_layout.addWidget(self.lbl_name)
-        name_layout.addStretch()
+        # Row 0: colour dot + name | armed badge (fixed height: 20px)
+        self.lbl_name = QLabel(f"<span style='color: {self.drone_color}'>●</span> {self.drone_name}")
+        self.lbl_name.setObjectName("cardName")
+        self.lbl_name.setFixedHeight(20)
         
-        # Right: Armed badge
         self.lbl_armed = QLabel("DISARMED")
         self.lbl_armed.setFixedHeight(20)
         self.lbl_armed.setAlignment(Qt.AlignCenter)
-        self.lbl_armed.setStyleSheet("""
-            background-color: #404040;
-            color: #9ca3af;
-            border: 1px solid #555555;
-            border-radius: 3px;
-            padding: 2px 6px;
-            font-size: 8pt;
-            font-weight: bold;
-            font-family: 'Consolas', monospace;
-        """)
-        
-        header.addLayout(name_layout, 1)
-        header.addWidget(self.lbl_armed)
-        layout.addLayout(header)
-        
-        # Quick stats (4 columns, fixed height: 50px)
-        stats = QGridLayout()
-        stats.setSpacing(4)
-        stats.setContentsMargins(0, 0, 0, 0)
-        
-        self.stat_battery = self._create_stat("⚡", "100%", "#00ff88")
-        self.stat_signal = self._create_stat("📶", "95%", "#00ff88")
-        self.stat_satellites = self._create_stat("🛰", "12", "#00d4ff")
-        self.stat_distance = self._create_stat("📍", "0m", "#ffa500")
-        
-        stats.addWidget(self.stat_battery, 0, 0)
-        stats.addWidget(self.stat_signal, 0, 1)
-        stats.addWidget(self.stat_satellites, 0, 2)
-        stats.addWidget(self.stat_distance, 0, 3)
-        
-        layout.addLayout(stats)
-        
-        # Flight data (3 columns, fixed height: 50px)
-        flight = QGridLayout()
-        flight.setSpacing(4)
-        flight.setContentsMargins(0, 0, 0, 0)
-        
-        self.flight_alt = self._create_flight_widget("ALT", "0m")
-        self.flight_spd = self._create_flight_widget("SPD", "0.0")
-        self.flight_hdg = self._create_flight_widget("HDG", "0°")
-        
-        flight.addWidget(self.flight_alt, 0, 0)
-        flight.addWidget(self.flight_spd, 0, 1)
-        flight.addWidget(self.flight_hdg, 0, 2)
-        
-        layout.addLayout(flight)
-        
-        # Bottom: Mode + Arm button (fixed height: 32px)
-        bottom = QHBoxLayout()
-        bottom.setSpacing(6)
-        bottom.setContentsMargins(0, 0, 0, 0)
+        self.lbl_armed.setObjectName("armedBadge")
+        self.lbl_armed.setProperty("state", "disarmed")
+        
+        layout.addWidget(self.lbl_name, 0, 0, 1, 8)
+        layout.addWidget(self.lbl_armed, 0, 8, 1, 4, Qt.AlignRight)
+        
+        # Row 1: quick stats (4 tiles, fixed height: 48px)
+        self.stat_battery, self._val_battery = self._create_stat("⚡", "100%", "#00ff88")
+        self.stat_signal, self._val_signal = self._create_stat("📶", "95%", "#00ff88")
+        self.stat_satellites, self._val_sats = self._create_stat("🛰", "12", "#00d4ff")
+        self.stat_distance, self._val_dist = self._create_stat("📍", "0m", "#ffa500")
+        
+        layout.addWidget(self.stat_battery, 1, 0, 1, 3)
+        layout.addWidget(self.stat_signal, 1, 3, 1, 3)
+        layout.addWidget(self.stat_satellites, 1, 6, 1, 3)
+        layout.addWidget(self.stat_distance, 1, 9, 1, 3)
         
+        # Row 2: flight data (3 tiles, fixed height: 48px)
+        self.flight_alt, self._val_alt = self._create_flight_widget("ALT", "0m")
+        self.flight_spd, self._val_spd = self._create_flight_widget("SPD", "0.0")
+        self.flight_hdg, self._val_hdg = self._create_flight_widget("HDG", "0°")
+        
+        layout.addWidget(self.flight_alt, 2, 0, 1, 4)
+        layout.addWidget(self.flight_spd, 2, 4, 1, 4)
+        layout.addWidget(self.flight_hdg, 2, 8, 1, 4)
+        
+        # Row 3: mode + arm button (fixed height: 28px)
         self.lbl_mode = QLabel("STABILIZE")
         self.lbl_mode.setFixedHeight(28)
         self.lbl_mode.setAlignment(Qt.AlignCenter)
-        self.lbl_mode.setStyleSheet(f"""
-            background-color: {self.drone_color}30;
-            color: {self.drone_color};
-            border: 1px solid {self.drone_color}80;
-            border-radius: 4px;
-            padding: 4px 8px;
-            font-size: 9pt;
-            font-weight: bold;
-            font-family: 'Consolas', monospace;
-        """)
+        self.lbl_mode.setObjectName("modeBadge")
         
         self.btn_arm = QPushButton("⚡")
         self.btn_arm.setFixedSize(28, 28)
-        self.btn_arm.clicked.connect(lambda: self.arm_clicked.emit(self.drone_id))
-        self.btn_arm.setStyleSheet("""
-            QPushButton {
-                background-color: #00ff8830;
-                color: #00ff88;
-                border: 1px solid #00ff8880;
-                border-radius: 4px;
-                font-size: 12pt;
-            }
-            QPushButton:hover { background-color: #00ff8850; }
-            QPushButton:pressed { background-color: #00ff8820; }
-        """)
-        
-        bottom.addWidget(self.lbl_mode, 1)
-        bottom.addWidget(self.btn_arm)
-        
-        layout.addLayout(bottom)
-        layout.addStretch()
+        self.btn_arm.clicked.connect(self._on_arm_clicked)
+        self.btn_arm.setObjectName("armButton")
+        self.btn_arm.setProperty("state", "disarmed")
+        
+        layout.addWidget(self.lbl_mode, 3, 0, 1, 10)
+        layout.addWidget(self.btn_arm, 3, 10, 1, 2, Qt.AlignRight)
+        
+        # Free space goes below the content
+        layout.setRowStretch(4, 1)
+        
+    def _on_arm_clicked(self):
+        self.arm_clicked.emit(self.drone_id)
         
     def _create_stat(self, icon, value, color):
-        """Create stat widget with fixed size"""
+        """Create stat widget with fixed size; returns (widget, value label)"""
         widget = QWidget()
         widget.setFixedHeight(48)
-        widget.setStyleSheet("background-color: #0a0a0a; border-radius: 3px;")
+        widget.setObjectName("tile")
         
         layout = QVBoxLayout(widget)
         layout.setContentsMargins(2, 4, 2, 4)
         layout.setSpacing(2)
         
-        lbl_icon = QLabel(icon)
+        lbl_icon = QLabel()
+        lbl_icon.setPixmap(_icon_pixmap(icon, color))
         lbl_icon.setAlignment(Qt.AlignCenter)
         lbl_icon.setFixedHeight(16)
-        lbl_icon.setStyleSheet(f"font-size: 11pt; color: {color};")
         
         lbl_value = QLabel(value)
-        lbl_value.setObjectName("value")
+        lbl_value.setObjectName("statValue")
         lbl_value.setAlignment(Qt.AlignCenter)
         lbl_value.setFixedHeight(18)
-        lbl_value.setStyleSheet(f"""
-            font-size: 8pt;
-            font-weight: bold;
-            font-family: 'Consolas', monospace;
-            color: {color};
-        """)
+        lbl_value.setProperty("valueColor", color)
+        self._label_color[lbl_value] = color
         
         layout.addWidget(lbl_icon)
         layout.addWidget(lbl_value)
         layout.addStretch()
         
-        return widget
+        return widget, lbl_value
     
     def _create_flight_widget(self, label, value):
-        """Create flight data widget with fixed size"""
+        """Create flight data widget with fixed size; returns (widget, value label)"""
         widget = QWidget()
         widget.setFixedHeight(48)
-        widget.setStyleSheet("background-color: #0a0a0a; border-radius: 3px;")
+        widget.setObjectName("tile")
         
         layout = QVBoxLayout(widget)
         layout.setContentsMargins(2, 4, 2, 4)
@@ -202,118 +276,116 @@ class DroneStatusCard(QWidget):
         lbl_label = QLabel(label)
         lbl_label.setAlignment(Qt.AlignCenter)
         lbl_label.setFixedHeight(14)
-        lbl_label.setStyleSheet("""
-            font-size: 7pt;
-            color: #9ca3af;
-            font-family: 'Consolas', monospace;
-        """)
+        lbl_label.setObjectName("flightLabel")
         
         lbl_value = QLabel(value)
-        lbl_value.setObjectName("value")
+        lbl_value.setObjectName("flightValue")
         lbl_value.setAlignment(Qt.AlignCenter)
         lbl_value.setFixedHeight(20)
-        lbl_value.setStyleSheet("""
-            font-size: 10pt;
-            font-weight: bold;
-            color: white;
-            font-family: 'Consolas', monospace;
-        """)
         
         layout.addWidget(lbl_label)
         layout.addWidget(lbl_value)
         layout.addStretch()
         
-        return widget
+        return widget, lbl_value
     
     def update_status(self, telemetry):
-        """Update card with telemetry data"""
-        # Armed status
-        armed = telemetry.get('armed', False)
-        if armed:
-            self.lbl_armed.setText("ARMED")
-            self.lbl_armed.setStyleSheet("""
-                background-color: #00ff8830;
-                color: #00ff88;
-                border: 1px solid #00ff8880;
-                border-radius: 3px;
-                padding: 2px 6px;
-                font-size: 8pt;
-                font-weight: bold;
-                font-family: 'Consolas', monospace;
-            """)
-            self.btn_arm.setStyleSheet("""
-                QPushButton {
-                    background-color: #ff333330;
-                    color: #ff3333;
-                    border: 1px solid #ff333380;
-                    border-radius: 4px;
-                    font-size: 12pt;
-                }
-                QPushButton:hover { background-color: #ff333350; }
-            """)
-        else:
-            self.lbl_armed.setText("DISARMED")
-            self.lbl_armed.setStyleSheet("""
-                background-color: #404040;
-                color: #9ca3af;
-                border: 1px solid #555555;
-                border-radius: 3px;
-                padding: 2px 6px;
-                font-size: 8pt;
-                font-weight: bold;
-                font-family: 'Consolas', monospace;
-            """)
-        
-        # Update stats with proper elision
-        battery = telemetry.get('battery_percent', 100)
-        self._update_stat(self.stat_battery, f"{battery:.0f}%", self._get_battery_color(battery))
-        
-        rssi = telemetry.get('rssi', 0)
-        self._update_stat(self.stat_signal, f"{rssi}%", self._get_signal_color(rssi))
-        
-        sats = telemetry.get('satellites', 0)
-        self._update_stat(self.stat_satellites, str(sats), "#00d4ff")
-        
-        distance = telemetry.get('distance_to_home', 0)
-        if distance > 999:
-            dist_text = f"{distance/1000:.1f}km"
-        else:
-            dist_text = f"{distance:.0f}m"
-        self._update_stat(self.stat_distance, dist_text, "#ffa500")
-        
-        # Update flight data
-        alt = telemetry.get('altitude_agl', 0)
-        self._update_flight(self.flight_alt, f"{alt:.0f}m" if alt < 1000 else f"{alt/1000:.1f}km")
-        
-        spd = telemetry.get('ground_speed', 0)
-        self._update_flight(self.flight_spd, f"{spd:.1f}")
-        
-        hdg = telemetry.get('heading', 0)
-        self._update_flight(self.flight_hdg, f"{hdg:.0f}°")
-        
-        # Mode (elide if too long)
-        mode = telemetry.get('flight_mode', 'UNKNOWN')
-        if len(mode) > 10:
-            mode = mode[:10]
-        self.lbl_mode.setText(mode)
+        """Update card with telemetry data (coalesced to CARD_UPDATE_INTERVAL_MS)"""
+        self._pending = telemetry
+        if not self._status_timer.isActive():
+            self._status_timer.start()
+    
+    def _apply_status(self):
+        """Apply the latest telemetry; while hidden it is kept for showEvent"""
+        telemetry = self._pending
+        if telemetry is None or not self.isVisible():
+            return
+        self._pending = None
+        
+        get = telemetry.get
+        armed = get('armed', False)
+        battery = get('battery_percent', 100)
+        rssi = get('rssi', 0)
+        sats = get('satellites', 0)
+        distance = get('distance_to_home', 0)
+        alt = get('altitude_agl', 0)
+        spd = get('ground_speed', 0)
+        hdg = get('heading', 0)
+        mode = get('flight_mode', 'UNKNOWN')
+        
+        # Nothing to format if the raw values are unchanged since the last apply
+        values = (armed, battery, rssi, sats, distance, alt, spd, hdg, mode)
+        if values == self._last_values:
+            return
+        self._last_values = values
+        
+        # Label writes below suspend updates on the first actual change, so a
+        # changed card repaints once and an unchanged one not at all
+        try:
+            # Armed status
+            if armed != self._armed_shown:
+                self._armed_shown = armed
+                self._begin_update()
+                state = "armed" if armed else "disarmed"
+                self.lbl_armed.setText(state.upper())
+                set_style_property(self.lbl_armed, "state", state)
+                set_style_property(self.btn_arm, "state", state)
+            
+            # Update stats with proper elision
+            self._update_stat(self._val_battery, f"{battery:.0f}%", self._get_battery_color(battery))
+            self._update_stat(self._val_signal, f"{rssi}%", self._get_signal_color(rssi))
+            self._update_stat(self._val_sats, str(sats), "#00d4ff")
+            
+            if distance > 999:
+                dist_text = f"{distance/1000:.1f}km"
+            else:
+                dist_text = f"{distance:.0f}m"
+            self._update_stat(self._val_dist, dist_text, "#ffa500")
+            
+            # Update flight data
+            self._update_flight(self._val_alt, f"{alt:.0f}m" if alt < 1000 else f"{alt/1000:.1f}km")
+            self._update_flight(self._val_spd, f"{spd:.1f}")
+            self._update_flight(self._val_hdg, f"{hdg:.0f}°")
+            
+            # Mode (elide if too long)
+            self._set_if_changed(self.lbl_mode, mode[:10])
+        finally:
+            if self._batching:
+                self._batching = False
+                self.setUpdatesEnabled(True)
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._apply_status()
+    
+    def _begin_update(self):
+        """Suspend repaints until _apply_status finishes"""
+        if not self._batching:
+            self._batching = True
+            self.setUpdatesEnabled(False)
+    
+    def _set_if_changed(self, lbl, text):
+        """setText only when the displayed text differs"""
+        if self._label_text.get(lbl) != text:
+            self._begin_update()
+            self._label_text[lbl] = text
+            lbl.setText(text)
+    
+    def _update_stat(self, lbl, value, color):
+        """Update stat value label"""
+        self._set_if_changed(lbl, value)
+        if self._label_color.get(lbl) != color:
+            self._begin_update()
+            self._set_value_color(lbl, color)
     
-    def _update_stat(self, widget, value, color):
-        """Update stat widget value"""
-        lbl = widget.findChild(QLabel, "value")
-        if lbl:
-            lbl.setText(value)
-            lbl.setStyleSheet(f"""
-                font-size: 8pt;
-                font-weight: bold;
-                font-family: 'Consolas', monospace;
-                color: {color};
-            """)
+    def _set_value_color(self, lbl, color):
+        """Recolour a stat value label through its valueColor property"""
+        self._label_color[lbl] = color
+        set_style_property(lbl, "valueColor", color)
     
-    def _update_flight(self, widget, value):
-        """Update flight widget value"""
-        lbl = widget.findChild(QLabel, "value")
-        if lbl:
-            lbl.setText(value)
+    def _update_flight(self, lbl, value):
+        """Update flight value label"""
+        self._set_if_changed(lbl, value)
     
     def _get_battery_color(self, percent):
         return "#00ff88" if percent > 50 else "#ffa500" if percent > 25 else "#ff3333"
@@ -1,10 +1,14 @@
 import math
+from time import perf_counter
 from PyQt5 import QtCore, QtGui, QtWidgets
 
 # HUD Configuration constants
 PIXELS_PER_PITCH_DEGREE = 8  # Pixels per degree of pitch
 PIXELS_PER_HEADING_DEGREE = 10  # Pixels per degree of heading
 HEADING_TAPE_RANGE_DEGREES = 30  # Degrees to show on each side of current heading
+HUD_MAX_FPS = 30  # Repaint cap, independent of telemetry rate
+# GPS_FIX_TYPE names, indexed by fix_type
+GPS_FIX_LABELS = ("NO GPS", "NO FIX", "2D", "3D", "DGPS", "RTK FLT", "RTK FIX")
 
 class ReferenceStyleHUDWidget(QtWidgets.QWidget):
     def __init__(self, parent=None):
@@ -34,6 +38,12 @@ class ReferenceStyleHUDWidget(QtWidgets.QWidget):
         self._data_timeout = 5.0  # seconds before data is considered stale
         
         self.setMinimumSize(800, 600)
+        
+        # Telemetry setters only mark the HUD dirty; this timer paints at most HUD_MAX_FPS
+        self._repaint_timer = QtCore.QTimer(self)
+        self._repaint_timer.setSingleShot(True)
+        self._repaint_timer.setInterval(1000 // HUD_MAX_FPS)
+        self._repaint_timer.timeout.connect(self.update)
 
         # --- Reference Style Color Scheme ---
         self.color_primary = QtGui.QColor(255, 255, 255)    # White
@@ -54,22 +64,22 @@ class ReferenceStyleHUDWidget(QtWidgets.QWidget):
         self.font_tiny = QtGui.QFont("Arial", 8)
 
     def update_flight_mode(self, mode):
+        if mode == self.flight_mode:
+            return
         self.flight_mode = mode
-        self.update()
+        self._schedule_repaint()
 
     def update_attitude(self, roll, pitch, yaw):
-        import time
         # Roll and pitch are in radians - store as-is for horizon display
         self.roll = roll
         self.pitch = pitch
         # Store raw yaw in radians (used for roll pointer, heading comes from VFR_HUD)
         self._yaw_rad = yaw
         self._has_attitude_data = True
-        self._last_attitude_time = time.time()
-        self.update()
+        self._last_attitude_time = perf_counter()
+        self._schedule_repaint()
 
     def update_vfr(self, heading, airspeed, groundspeed, alt):
-        import time
         # VFR_HUD heading is already in degrees (0-360) from flight controller
         # Use it directly without conversion
         self.heading = int(heading) % 360 if heading is not None else 0
@@ -77,27 +87,31 @@ class ReferenceStyleHUDWidget(QtWidgets.QWidget):
         self.groundspeed = groundspeed
         self.altitude = alt
         self._has_vfr_data = True
-        self._last_vfr_time = time.time()
-        self.update()
+        self._last_vfr_time = perf_counter()
+        self._schedule_repaint()
 
     def update_battery(self, level):
         self.battery_level = level
         self._has_battery_data = True
-        self.update()
+        self._schedule_repaint()
 
     def update_gps(self, fix_type, satellites):
         self.gps_fix = fix_type
         self.gps_sats = satellites
         self._has_gps_data = True
-        self.update()
+        self._schedule_repaint()
 
     def update_connection_status(self, connected):
+        if connected == self._connected:
+            return
         self._connected = connected
-        self.update()
+        self._schedule_repaint()
 
     def update_armed_status(self, armed):
+        if armed == self._is_armed:
+            return
         self._is_armed = armed
-        self.update()
+        self._schedule_repaint()
     
     def reset_data_validity(self):
         """Reset data validity flags when disconnected"""
@@ -111,11 +125,16 @@ class ReferenceStyleHUDWidget(QtWidgets.QWidget):
         self.airspeed = 0.0
         self.groundspeed = 0.0
         self.altitude = 0.0
-        self.update()
+        self._schedule_repaint()
 
     def set_warning(self, warning):
         self.warning = warning
-        self.update()
+        self._schedule_repaint()
+
+    def _schedule_repaint(self):
+        """Coalesce repaint requests into one paint per frame interval"""
+        if not self._repaint_timer.isActive():
+            self._repaint_timer.start()
 
     def paintEvent(self, event):
         painter = QtGui.QPainter(self)
@@ -496,8 +515,9 @@ class ReferenceStyleHUDWidget(QtWidgets.QWidget):
         painter.setPen(self.color_primary)
         
         # GPS status
-        fix_map = {0: "NO GPS", 1: "NO FIX", 2: "2D", 3: "3D", 4: "DGPS", 5: "RTK FLT", 6: "RTK FIX"}
-        gps_text = f"GPS: {self.gps_sats} sats ({fix_map.get(self.gps_fix, 'N/A')})"
+        fix = self.gps_fix
+        fix_text = GPS_FIX_LABELS[fix] if 0 <= fix < len(GPS_FIX_LABELS) else 'N/A'
+        gps_text = f"GPS: {self.gps_sats} sats ({fix_text})"
         painter.drawText(w - 250, h - 60, gps_text)
         
         # Battery status
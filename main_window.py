@@ -7,24 +7,29 @@ New layout matching React UI design:
 """
 
 import sys
+from time import perf_counter
 from PyQt5 import QtCore, QtWidgets
 from PyQt5.QtWidgets import (QMainWindow, QTabWidget, QVBoxLayout, QHBoxLayout, 
                             QWidget, QSplitter, QGridLayout, QScrollArea, QLabel)
 from PyQt5.QtCore import Qt
 
 from drone_manager import DroneManager
-from drone_panel_widget import DronePanelWidget
+from drone_panel_widget import DronePanelWidget, RAD_TO_DEG
+from hud_widget_reference_style import ReferenceStyleHUDWidget
 from drone_status_card import DroneStatusCard
 from connection_sidebar import ConnectionSidebar
 from comparison_panel import ComparisonPanel
 from simple_controller import SimpleController
+from config import UI_UPDATE_RATE
+
+# Adaptive telemetry tick
+MIN_TICK_INTERVAL_MS = 16  # Never faster than ~60 Hz
+TICK_COST_SMOOTHING = 0.2  # EMA weight of the newest tick cost
 
 try:
     from professional_gcs_map import ProfessionalGCSMap
-    from hud_widget_reference_style import ReferenceStyleHUDWidget
 except ImportError:
     ProfessionalGCSMap = None
-    ReferenceStyleHUDWidget = None
 
 
 class MainWindow(QMainWindow):
@@ -48,14 +53,18 @@ class MainWindow(QMainWindow):
         # UI components
         self.status_cards = {}
         self.mini_huds = {}
+        self._hud_panel = None  # Drone panel currently holding panel_hud
         
         # Setup UI
         self._create_ui()
         
-        # Telemetry update timer
+        # Telemetry update timer (single-shot, re-armed after each tick so
+        # the period stays close to UI_UPDATE_RATE regardless of tick cost)
+        self._tick_cost_ms = 0.0
         self.update_timer = QtCore.QTimer()
-        self.update_timer.timeout.connect(self._update_all_drones)
-        self.update_timer.start(100)  # 10 Hz
+        self.update_timer.setSingleShot(True)
+        self.update_timer.timeout.connect(self._on_update_tick)
+        self.update_timer.start(UI_UPDATE_RATE)
         
     def _create_ui(self):
         """Create main UI with sidebar + tabs"""
@@ -105,6 +114,11 @@ class MainWindow(QMainWindow):
             }
         """)
         
+        # One HUD shared by the drone tabs; moved into the selected drone's panel
+        self.panel_hud = ReferenceStyleHUDWidget(self)
+        self.panel_hud.setFixedSize(400, 350)
+        self.panel_hud.hide()
+        
         # Tab 1: Combined View
         combined_tab = self._create_combined_tab()
         self.main_tabs.addTab(combined_tab, "● Combined View")
@@ -117,6 +131,7 @@ class MainWindow(QMainWindow):
         drone2_tab = self._create_individual_tab(self.drone_2_id, "Drone 2", "#a78bfa")
         self.main_tabs.addTab(drone2_tab, "Drone 2")
         
+        self.main_tabs.currentChanged.connect(self._on_tab_changed)
         content_layout.addWidget(self.main_tabs)
         main_splitter.addWidget(content_widget)
         
@@ -158,11 +173,10 @@ class MainWindow(QMainWindow):
         left_layout.addWidget(card1)
         
         # Drone 1 Full HUD
-        if ReferenceStyleHUDWidget:
-            hud1 = ReferenceStyleHUDWidget()
-            hud1.setFixedSize(400, 350)
-            self.mini_huds[self.drone_1_id] = hud1
-            left_layout.addWidget(hud1)
+        hud1 = ReferenceStyleHUDWidget()
+        hud1.setFixedSize(400, 350)
+        self.mini_huds[self.drone_1_id] = hud1
+        left_layout.addWidget(hud1)
         
         # Drone 2 Status Card
         card2 = DroneStatusCard(self.drone_2_id, self.drone_manager, "#a78bfa")
@@ -171,11 +185,10 @@ class MainWindow(QMainWindow):
         left_layout.addWidget(card2)
         
         # Drone 2 Full HUD
-        if ReferenceStyleHUDWidget:
-            hud2 = ReferenceStyleHUDWidget()
-            hud2.setFixedSize(400, 350)
-            self.mini_huds[self.drone_2_id] = hud2
-            left_layout.addWidget(hud2)
+        hud2 = ReferenceStyleHUDWidget()
+        hud2.setFixedSize(400, 350)
+        self.mini_huds[self.drone_2_id] = hud2
+        left_layout.addWidget(hud2)
         
         left_layout.addStretch()
         
@@ -201,6 +214,8 @@ class MainWindow(QMainWindow):
         # Map
         if not hasattr(self, 'map_widget'):
             self.map_widget = self._create_map_widget()
+            # Resolved once; the placeholder label has no position API
+            self._map_update_position = getattr(self.map_widget, 'update_uav_position_multi', None)
         
         map_container = QWidget()
         map_container.setStyleSheet("background: #1a1a1a; border: 1px solid #2a2a2a; border-radius: 6px;")
@@ -219,6 +234,7 @@ class MainWindow(QMainWindow):
         """)
         map_layout.addWidget(map_header)
         map_layout.addWidget(self.map_widget, 1)
+        self._map_layout = map_layout
         
         center_layout.addWidget(map_container, 3)
         
@@ -246,10 +262,12 @@ class MainWindow(QMainWindow):
         """)
         right_layout.addWidget(tel_header)
         
-        self.telemetry_messages = QtWidgets.QTextEdit()
+        self.telemetry_messages = QtWidgets.QPlainTextEdit()
         self.telemetry_messages.setReadOnly(True)
+        self.telemetry_messages.setUndoRedoEnabled(False)
+        self.telemetry_messages.setMaximumBlockCount(2000)
         self.telemetry_messages.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background: #0a0a0a;
                 border: none;
                 color: #9ca3af;
@@ -277,15 +295,33 @@ class MainWindow(QMainWindow):
         
         return panel
     
+    def _on_tab_changed(self, index):
+        """Move the shared HUD into the newly selected drone tab"""
+        panel = self.main_tabs.widget(index)
+        if not isinstance(panel, DronePanelWidget) or panel is self._hud_panel:
+            return
+        if self._hud_panel is not None:
+            self._hud_panel.detach_hud()
+        panel.attach_hud(self.panel_hud)
+        self._hud_panel = panel
+    
     def _create_map_widget(self):
-        """Create map widget"""
+        """Create map placeholder; the real map is built once the event loop runs"""
+        placeholder = QLabel("Map (Loading...)")
+        placeholder.setStyleSheet("background: #0a0a0a; color: #9ca3af; padding: 20px;")
+        placeholder.setAlignment(Qt.AlignCenter)
         if ProfessionalGCSMap:
-            return ProfessionalGCSMap()
-        else:
-            placeholder = QLabel("Map (Loading...)")
-            placeholder.setStyleSheet("background: #0a0a0a; color: #9ca3af; padding: 20px;")
-            placeholder.setAlignment(Qt.AlignCenter)
-            return placeholder
+            # Keep map construction out of the window's first paint
+            QtCore.QTimer.singleShot(0, self._finish_map_init)
+        return placeholder
+    
+    def _finish_map_init(self):
+        """Swap the placeholder for the real map"""
+        placeholder = self.map_widget
+        self.map_widget = ProfessionalGCSMap()
+        self._map_layout.replaceWidget(placeholder, self.map_widget)
+        placeholder.deleteLater()
+        self._map_update_position = getattr(self.map_widget, 'update_uav_position_multi', None)
     
     def _on_connect_drone(self, drone_id, port, baud):
         """Handle drone connection from sidebar"""
@@ -295,23 +331,34 @@ class MainWindow(QMainWindow):
             drone.baud = baud
             drone.worker.configure(port, baud)
             self.drone_manager.connect_drone(drone_id)
-            self.telemetry_messages.append(f"[{drone.name}] Connecting to {port} @ {baud}...")
+            self.telemetry_messages.appendPlainText(f"[{drone.name}] Connecting to {port} @ {baud}...")
     
     def _on_disconnect_drone(self, drone_id):
         """Handle drone disconnection from sidebar"""
         self.drone_manager.disconnect_drone(drone_id)
         drone = self.drone_manager.get_drone(drone_id)
         if drone:
-            self.telemetry_messages.append(f"[{drone.name}] Disconnected")
+            self.telemetry_messages.appendPlainText(f"[{drone.name}] Disconnected")
     
     def _on_arm_disarm(self, drone_id):
         """Handle arm/disarm from status card"""
         drone = self.drone_manager.get_drone(drone_id)
         if drone and drone.connected:
             self.drone_manager.send_command(drone_id, 'arm_disarm')
-            self.telemetry_messages.append(f"[{drone.name}] Arm/Disarm command sent")
+            self.telemetry_messages.appendPlainText(f"[{drone.name}] Arm/Disarm command sent")
         else:
-            self.telemetry_messages.append(f"[{drone.name}] Not connected!")
+            self.telemetry_messages.appendPlainText(f"[{drone.name}] Not connected!")
+    
+    def _on_update_tick(self):
+        """Run one telemetry tick and schedule the next one"""
+        start = perf_counter()
+        try:
+            self._update_all_drones()
+        finally:
+            elapsed_ms = (perf_counter() - start) * 1000
+            self._tick_cost_ms += TICK_COST_SMOOTHING * (elapsed_ms - self._tick_cost_ms)
+            interval = max(int(UI_UPDATE_RATE - self._tick_cost_ms), MIN_TICK_INTERVAL_MS)
+            self.update_timer.start(interval)
     
     def _update_all_drones(self):
         """Update telemetry for all drones"""
@@ -322,6 +369,11 @@ class MainWindow(QMainWindow):
         for drone_id, controller in self.controllers.items():
             controller.update_ui()
         
+        # Keep draining worker queues while minimized/hidden, but skip the widgets;
+        # showEvent refreshes them once the window is back
+        if not self.isVisible() or self.windowState() & Qt.WindowMinimized:
+            return
+        
         # Update sidebar connection status
         if drone1:
             self.sidebar.update_connection_status(self.drone_1_id, drone1.connected)
@@ -355,7 +407,8 @@ class MainWindow(QMainWindow):
             self.comparison_panel.update_comparison(drone1.telemetry, drone2.telemetry)
         
         # Update map
-        if drone1 and drone1.connected and hasattr(self.map_widget, 'update_uav_position_multi'):
+        update_position = self._map_update_position
+        if drone1 and drone1.connected and update_position:
             gps = drone1.telemetry.get('gps', {})
             att = drone1.telemetry.get('attitude', {})
             vfr = drone1.telemetry.get('vfr_hud', {})
@@ -363,14 +416,13 @@ class MainWindow(QMainWindow):
             lat = gps.get('lat', 0)
             lon = gps.get('lon', 0)
             if lat != 0 or lon != 0:
-                import math
-                heading = math.degrees(att.get('yaw', 0))
-                self.map_widget.update_uav_position_multi(
+                heading = att.get('yaw', 0) * RAD_TO_DEG
+                update_position(
                     self.drone_1_id, lat, lon, heading, 
                     vfr.get('alt', 0), vfr.get('groundspeed', 0), "#00d4ff"
                 )
         
-        if drone2 and drone2.connected and hasattr(self.map_widget, 'update_uav_position_multi'):
+        if drone2 and drone2.connected and update_position:
             gps = drone2.telemetry.get('gps', {})
             att = drone2.telemetry.get('attitude', {})
             vfr = drone2.telemetry.get('vfr_hud', {})
@@ -378,9 +430,8 @@ class MainWindow(QMainWindow):
             lat = gps.get('lat', 0)
             lon = gps.get('lon', 0)
             if lat != 0 or lon != 0:
-                import math
-                heading = math.degrees(att.get('yaw', 0))
-                self.map_widget.update_uav_position_multi(
+                heading = att.get('yaw', 0) * RAD_TO_DEG
+                update_position(
                     self.drone_2_id, lat, lon, heading,
                     vfr.get('alt', 0), vfr.get('groundspeed', 0), "#a78bfa"
                 )
@@ -417,8 +468,13 @@ class MainWindow(QMainWindow):
         
         # Add message to telemetry log
         status = "Connected" if drone.connected else "Disconnected"
-        self.telemetry_messages.append(f"[{drone.name}] {status}")
+        self.telemetry_messages.appendPlainText(f"[{drone.name}] {status}")
 
+    def showEvent(self, event):
+        """Bring combined view widgets up to date after being hidden/minimized"""
+        super().showEvent(event)
+        self._update_all_drones()
+    
     def closeEvent(self, event):
         """Clean up on close"""
         self.update_timer.stop()
@@ -1,7 +1,10 @@
+import os
+import sys
 import threading
 import time
 import math
 import logging
+from collections import deque
 from queue import Queue, Empty
 from pymavlink import mavutil
 
@@ -22,10 +25,24 @@ except ImportError:
 # Configuration constants with fallbacks
 HEARTBEAT_CHECK_INTERVAL_SEC = 1.0
 WORKER_LOOP_SLEEP_SEC = 0.01
+WORKER_MAX_MESSAGES_PER_LOOP = 100  # Bound a drain so control commands are not starved
 DATA_RATE_CALCULATION_INTERVAL_SEC = 5.0
 DATA_RATE_LOW_THRESHOLD_HZ = 1.0
 COMMAND_ACK_TIMEOUT_SEC = 3
 
+# Minimum spacing between queued updates per message type (what the UI can repaint)
+TELEMETRY_MIN_INTERVAL_SEC = {
+    "ATTITUDE": 0.033,     # ~30 Hz
+    "VFR_HUD": 0.1,        # 10 Hz
+    "GPS_RAW_INT": 0.2,    # 5 Hz
+}
+
+# Samples may arrive this much early and still pass, so arrival jitter on a stream
+# running at exactly the cap (e.g. 5 Hz GPS) doesn't drop every other sample
+TELEMETRY_JITTER_TOLERANCE = 0.8
+_TELEMETRY_MIN_GAP_SEC = {mtype: interval * TELEMETRY_JITTER_TOLERANCE
+                          for mtype, interval in TELEMETRY_MIN_INTERVAL_SEC.items()}
+
 class MavlinkWorker(threading.Thread):
     def __init__(self):
         super().__init__(daemon=True)
@@ -33,11 +50,13 @@ class MavlinkWorker(threading.Thread):
         self._running = False
         self._device = None
         self._baud = config.get("mavlink", "default_baud", 57600) if config else 57600
-        self._out_queue = Queue()
+        # Worker -> UI handoff; deque append/popleft are atomic, so no lock is taken per message
+        self._out_queue = deque()
         self._control_queue = Queue()
         self._last_heartbeat = 0
         self._connected = False
         self._is_armed = False
+        self._mode_by_id = None  # custom_mode -> name, built from the first heartbeat
         self._lock = threading.Lock()
         
         # Logging
@@ -55,11 +74,15 @@ class MavlinkWorker(threading.Thread):
         # Message validation
         self.message_validation = config.get("mavlink", "message_validation", True) if config else True
         
+        # Serial latency tuning
+        self.low_latency_serial = config.get("mavlink", "low_latency_serial", True) if config else True
+        
         # Data quality tracking
         self._message_counts = {}
         self._last_message_time = {}
         self._data_rates = {}
         self._total_messages = 0
+        self._last_sent = {}  # mtype -> monotonic time of last queued update
 
     def configure(self, device, baud):
         self._device = device
@@ -95,13 +118,10 @@ class MavlinkWorker(threading.Thread):
             return self._is_armed
 
     def get_updates(self):
-        updates = []
-        while True:
-            try:
-                updates.append(self._out_queue.get_nowait())
-            except Empty:
-                break
-        return updates
+        # Single consumer: pop only what was queued when the drain started
+        out = self._out_queue
+        popleft = out.popleft
+        return [popleft() for _ in range(len(out))]
 
     def run(self):
         self._running = True
@@ -130,33 +150,42 @@ class MavlinkWorker(threading.Thread):
                 with self._lock:
                     if (self._connected and current_time - self._last_heartbeat > HEARTBEAT_TIMEOUT):
                         self._connected = False
-                        self._out_queue.put(("error", "Heartbeat timeout - connection lost"))
-                        self._out_queue.put(("status", "Disconnected"))
+                        self._out_queue.append(("error", "Heartbeat timeout - connection lost"))
+                        self._out_queue.append(("status", "Disconnected"))
 
             with self._lock:
                 conn = self._conn
             
             if conn:
                 try:
-                    msg = conn.recv_match(blocking=False)
-                    if msg: 
+                    # Wait on the link (select-based) instead of sleeping, then
+                    # drain whatever else already arrived
+                    msg = conn.recv_match(blocking=True, timeout=WORKER_LOOP_SLEEP_SEC)
+                    processed = 0
+                    while msg and processed < WORKER_MAX_MESSAGES_PER_LOOP:
+                        self._process_message(msg)
+                        processed += 1
+                        msg = conn.recv_match(blocking=False)
+                    if msg:
                         self._process_message(msg)
                 except Exception as e:
-                    self._out_queue.put(("error", f"Receive error: {e}"))
+                    self._out_queue.append(("error", f"Receive error: {e}"))
                     with self._lock:
                         self._conn = None
                         self._connected = False
-                    self._out_queue.put(("status", "Disconnected"))
-            time.sleep(WORKER_LOOP_SLEEP_SEC)
+                    self._out_queue.append(("status", "Disconnected"))
+            else:
+                time.sleep(WORKER_LOOP_SLEEP_SEC)
 
     def stop(self):
         self._running = False
         self._do_disconnect()
 
     def _do_connect(self):
-        if not self._device: return self._out_queue.put(("error", "No device configured"))
+        if not self._device: return self._out_queue.append(("error", "No device configured"))
+        self._mode_by_id = None
         try:
-            self._out_queue.put(("status", f"Connecting to {self._device} @ {self._baud}"))
+            self._out_queue.append(("status", f"Connecting to {self._device} @ {self._baud}"))
             # Add connection timeout and better error handling
             self._conn = mavutil.mavlink_connection(
                 self._device, 
@@ -166,13 +195,16 @@ class MavlinkWorker(threading.Thread):
                 source_component=0   # GCS component ID,
             )
             
+            if self.low_latency_serial:
+                self._set_low_latency()
+            
             # Implement better heartbeat timeout handling
             self._conn.wait_heartbeat(timeout=CONNECTION_TIMEOUT)
             
             with self._lock:
                 self._connected = True
             self._last_heartbeat = time.time()
-            self._out_queue.put(("status", "Connected"))
+            self._out_queue.append(("status", "Connected"))
             
             # Request specific data streams instead of all data streams
             # This gives better control over bandwidth and data accuracy
@@ -193,12 +225,39 @@ class MavlinkWorker(threading.Thread):
                 self._conn.target_component, 
                 mavutil.mavlink.MAV_DATA_STREAM_EXTRA2, 2, 1)  # 2Hz for VFR_HUD
         except Exception as e:
-            self._out_queue.put(("error", f"Connection failed: {e}"))
+            self._out_queue.append(("error", f"Connection failed: {e}"))
             if self._conn: self._conn.close()
             with self._lock:
                 self._conn = None
                 self._connected = False
 
+    def _set_low_latency(self):
+        """
+        Stop USB-serial adapters from batching reads (FTDI default latency is 16 ms)
+        Linux only; other platforms keep the driver defaults
+        """
+        port = getattr(self._conn, "port", None)
+        if port is None or not sys.platform.startswith("linux"):
+            return
+        
+        # pyserial sets ASYNC_LOW_LATENCY via TIOCGSERIAL/TIOCSSERIAL
+        try:
+            port.set_low_latency_mode(True)
+            self.logger.info(f"Low latency mode enabled on {self._device}")
+            return
+        except (AttributeError, ValueError, OSError) as e:
+            self.logger.debug(f"ASYNC_LOW_LATENCY not available on {self._device}: {e}")
+        
+        # Fallback for FTDI adapters that ignore the serial flag
+        tty = os.path.basename(os.path.realpath(self._device))
+        latency_path = f"/sys/bus/usb-serial/devices/{tty}/latency_timer"
+        try:
+            with open(latency_path, "w") as f:
+                f.write("1")
+            self.logger.info(f"FTDI latency timer set to 1 ms on {tty}")
+        except OSError as e:
+            self.logger.debug(f"Could not set {latency_path}: {e}")
+
     def _do_disconnect(self):
         with self._lock:
             conn = self._conn
@@ -209,11 +268,11 @@ class MavlinkWorker(threading.Thread):
             try: 
                 conn.close()
             except Exception as e:
-                self._out_queue.put(("error", f"Error closing connection: {e}"))
-        self._out_queue.put(("status", "Disconnected"))
+                self._out_queue.append(("error", f"Error closing connection: {e}"))
+        self._out_queue.append(("status", "Disconnected"))
 
     def _do_arm_disarm(self, force=False):
-        if not self._conn: return self._out_queue.put(("error", "Not connected"))
+        if not self._conn: return self._out_queue.append(("error", "Not connected"))
 
         # Check armed status with lock
         is_armed = False
@@ -222,26 +281,26 @@ class MavlinkWorker(threading.Thread):
 
         try:
             if is_armed:
-                self._out_queue.put(("status", "Sending Disarm command..."))
+                self._out_queue.append(("status", "Sending Disarm command..."))
                 self._conn.mav.command_long_send(
                     self._conn.target_system, self._conn.target_component,
                     mavutil.mavlink.MAV_CMD_COMPONENT_ARM_DISARM, 0,
                     0, 0, 0, 0, 0, 0, 0)
             else:
                 if force:
-                    self._out_queue.put(("status", "Sending Force Arm command..."))
+                    self._out_queue.append(("status", "Sending Force Arm command..."))
                     self._conn.mav.command_long_send(
                         self._conn.target_system, self._conn.target_component,
                         mavutil.mavlink.MAV_CMD_COMPONENT_ARM_DISARM, 0,
                         1, 21196.0, 0, 0, 0, 0, 0)
                 else:
-                    self._out_queue.put(("status", "Sending Arm command..."))
+                    self._out_queue.append(("status", "Sending Arm command..."))
                     self._conn.mav.command_long_send(
                         self._conn.target_system, self._conn.target_component,
                         mavutil.mavlink.MAV_CMD_COMPONENT_ARM_DISARM, 0,
                         1, 0, 0, 0, 0, 0, 0)
         except Exception as e:
-            self._out_queue.put(("error", f"Failed to send Arm/Disarm command: {e}"))
+            self._out_queue.append(("error", f"Failed to send Arm/Disarm command: {e}"))
             return
 
         # Check for acknowledgment
@@ -249,57 +308,57 @@ class MavlinkWorker(threading.Thread):
             ack = self._conn.recv_match(type='COMMAND_ACK', blocking=True, timeout=COMMAND_ACK_TIMEOUT_SEC)
             if ack and ack.command == mavutil.mavlink.MAV_CMD_COMPONENT_ARM_DISARM:
                 if ack.result == mavutil.mavlink.MAV_RESULT_ACCEPTED:
-                    self._out_queue.put(("status", "Arm/Disarm command accepted by FCU."))
+                    self._out_queue.append(("status", "Arm/Disarm command accepted by FCU."))
                 else:
                     result_name = "UNKNOWN"
                     if hasattr(mavutil.mavlink, 'enums') and 'MAV_RESULT' in mavutil.mavlink.enums:
                         result_name = mavutil.mavlink.enums['MAV_RESULT'].get(ack.result, "UNKNOWN")
-                    self._out_queue.put(("error", f"Arm/Disarm command rejected: {result_name}"))
+                    self._out_queue.append(("error", f"Arm/Disarm command rejected: {result_name}"))
             else:
-                self._out_queue.put(("error", "No acknowledgment for Arm/Disarm command."))
+                self._out_queue.append(("error", "No acknowledgment for Arm/Disarm command."))
         except Exception as e:
-            self._out_queue.put(("error", f"Failed to receive acknowledgment for Arm/Disarm command: {e}"))
+            self._out_queue.append(("error", f"Failed to receive acknowledgment for Arm/Disarm command: {e}"))
 
     def _do_set_mode(self, mode_id):
         with self._lock:
             conn = self._conn
         
         if not conn: 
-            return self._out_queue.put(("error", "Not connected"))
+            return self._out_queue.append(("error", "Not connected"))
         
-        self._out_queue.put(("status", f"Sending Set Mode command (Mode ID: {mode_id})..."))
+        self._out_queue.append(("status", f"Sending Set Mode command (Mode ID: {mode_id})..."))
         try:
             conn.mav.set_mode_send(conn.target_system, mavutil.mavlink.MAV_MODE_FLAG_CUSTOM_MODE_ENABLED, mode_id)
             
             # Wait for mode change confirmation via heartbeat rather than COMMAND_ACK
             # SET_MODE doesn't always generate COMMAND_ACK, but mode change is reflected in heartbeat
-            self._out_queue.put(("status", f"Set mode command sent for mode {mode_id}. Waiting for confirmation..."))
+            self._out_queue.append(("status", f"Set mode command sent for mode {mode_id}. Waiting for confirmation..."))
         except Exception as e:
-            self._out_queue.put(("error", f"Failed to set mode: {e}"))
+            self._out_queue.append(("error", f"Failed to set mode: {e}"))
 
     def _do_mission_start(self):
-        if not self._conn: return self._out_queue.put(("error", "Not connected"))
-        self._out_queue.put(("status", "Sending Mission Start command (MAV_CMD_MISSION_START)..."))
+        if not self._conn: return self._out_queue.append(("error", "Not connected"))
+        self._out_queue.append(("status", "Sending Mission Start command (MAV_CMD_MISSION_START)..."))
         try:
             self._conn.mav.command_long_send(
                 self._conn.target_system, self._conn.target_component,
                 mavutil.mavlink.MAV_CMD_MISSION_START, 0,
                 0, 0, 0, 0, 0, 0, 0)
-            self._out_queue.put(("status", "Mission Start command sent."))
+            self._out_queue.append(("status", "Mission Start command sent."))
         except Exception as e:
-            self._out_queue.put(("error", f"Failed to send mission start: {e}"))
+            self._out_queue.append(("error", f"Failed to send mission start: {e}"))
 
     def _do_abort_land(self):
-        if not self._conn: return self._out_queue.put(("error", "Not connected"))
-        self._out_queue.put(("status", "Sending Abort Landing command (MAV_CMD_NAV_RETURN_TO_LAUNCH)..."))
+        if not self._conn: return self._out_queue.append(("error", "Not connected"))
+        self._out_queue.append(("status", "Sending Abort Landing command (MAV_CMD_NAV_RETURN_TO_LAUNCH)..."))
         try:
             self._conn.mav.command_long_send(
                 self._conn.target_system, self._conn.target_component,
                 mavutil.mavlink.MAV_CMD_NAV_RETURN_TO_LAUNCH, 0,
                 0, 0, 0, 0, 0, 0, 0)
-            self._out_queue.put(("status", "Abort Landing (RTL) command sent."))
+            self._out_queue.append(("status", "Abort Landing (RTL) command sent."))
         except Exception as e:
-            self._out_queue.put(("error", f"Failed to send abort command: {e}"))
+            self._out_queue.append(("error", f"Failed to send abort command: {e}"))
 
     def get_data_quality(self):
         """Return current data quality metrics"""
@@ -331,48 +390,57 @@ class MavlinkWorker(threading.Thread):
             
             # Send data rate info for critical messages
             if mtype in ["ATTITUDE", "VFR_HUD", "GPS_RAW_INT"]:
-                self._out_queue.put(("data_rate", {mtype: self._data_rates[mtype]}))
+                self._out_queue.append(("data_rate", {mtype: self._data_rates[mtype]}))
+        
+        # Drop high-rate telemetry the UI could not show before it is decoded and queued
+        min_gap = _TELEMETRY_MIN_GAP_SEC.get(mtype)
+        if min_gap is not None:
+            now = time.monotonic()
+            if now - self._last_sent.get(mtype, 0.0) < min_gap:
+                return
+            self._last_sent[mtype] = now
         
         # Add timestamp for data freshness tracking
         timestamp = current_time
         
+        # mtype comes from the decoded message class, so its fields are always
+        # present; only the values need validating
         if mtype == "HEARTBEAT":
-            # Validate heartbeat data
-            if not hasattr(msg, 'type') or not hasattr(msg, 'autopilot'):
-                return  # Invalid heartbeat
-                
             self._last_heartbeat = timestamp
             with self._lock:
                 self._is_armed = (msg.base_mode & mavutil.mavlink.MAV_MODE_FLAG_SAFETY_ARMED) != 0
             
-            # Get flight mode
-            mode_id = msg.custom_mode
-            if self._conn and self._conn.mode_mapping():
-                mode = self._conn.mode_mapping().get(mode_id)
+            # Get flight mode (mode_mapping() is name -> id; reverse it once per connection)
+            mode_by_id = self._mode_by_id
+            if mode_by_id is None and self._conn:
+                mapping = self._conn.mode_mapping()
+                if mapping:
+                    mode_by_id = self._mode_by_id = {v: k for k, v in mapping.items()}
+            if mode_by_id:
+                mode = mode_by_id.get(msg.custom_mode)
                 if mode:
-                    self._out_queue.put(("flight_mode", mode))
+                    self._out_queue.append(("flight_mode", mode))
         elif mtype == "STATUSTEXT":
             text = msg.text
             if isinstance(text, bytes):
                 text = text.decode(errors="ignore")
-            self._out_queue.put(("statustext", text))
+            self._out_queue.append(("statustext", text))
         elif mtype == "ATTITUDE":
             # Validate attitude data
-            if (hasattr(msg, 'roll') and hasattr(msg, 'pitch') and hasattr(msg, 'yaw') and
-                math.isfinite(msg.roll) and math.isfinite(msg.pitch) and math.isfinite(msg.yaw) and
-                abs(msg.roll) <= math.pi and abs(msg.pitch) <= math.pi and abs(msg.yaw) <= math.pi):
-                self._out_queue.put(("attitude", {
+            roll, pitch, yaw = msg.roll, msg.pitch, msg.yaw
+            if (math.isfinite(roll) and math.isfinite(pitch) and math.isfinite(yaw) and
+                abs(roll) <= math.pi and abs(pitch) <= math.pi and abs(yaw) <= math.pi):
+                self._out_queue.append(("attitude", {
                     "timestamp": timestamp,
-                    "roll": msg.roll, 
-                    "pitch": msg.pitch, 
-                    "yaw": msg.yaw
+                    "roll": roll, 
+                    "pitch": pitch, 
+                    "yaw": yaw
                 }))
         elif mtype == "VFR_HUD":
             # Validate VFR_HUD data
-            if (hasattr(msg, 'airspeed') and hasattr(msg, 'groundspeed') and hasattr(msg, 'alt') and hasattr(msg, 'heading') and
-                math.isfinite(msg.airspeed) and math.isfinite(msg.groundspeed) and math.isfinite(msg.alt) and math.isfinite(msg.heading) and
+            if (math.isfinite(msg.airspeed) and math.isfinite(msg.groundspeed) and math.isfinite(msg.alt) and math.isfinite(msg.heading) and
                 msg.airspeed >= 0 and msg.groundspeed >= 0 and 0 <= msg.heading <= 360):
-                self._out_queue.put(("vfr_hud", {
+                self._out_queue.append(("vfr_hud", {
                     "timestamp": timestamp,
                     "airspeed": msg.airspeed, 
                     "groundspeed": msg.groundspeed, 
@@ -381,9 +449,7 @@ class MavlinkWorker(threading.Thread):
                 }))
         elif mtype == "GPS_RAW_INT":
             # Validate GPS data
-            if (hasattr(msg, 'fix_type') and hasattr(msg, 'satellites_visible') and 
-                hasattr(msg, 'lat') and hasattr(msg, 'lon') and hasattr(msg, 'eph') and hasattr(msg, 'epv') and
-                msg.fix_type >= 0 and msg.satellites_visible >= 0):
+            if msg.fix_type >= 0 and msg.satellites_visible >= 0:
                 
                 lat = msg.lat / 1e7
                 lon = msg.lon / 1e7
@@ -393,7 +459,7 @@ class MavlinkWorker(threading.Thread):
                 # Validate coordinates are finite and within valid range
                 if (math.isfinite(lat) and math.isfinite(lon) and 
                     -90 <= lat <= 90 and -180 <= lon <= 180):
-                    self._out_queue.put(("gps", {
+                    self._out_queue.append(("gps", {
                         "timestamp": timestamp,
                         "fix_type": msg.fix_type, 
                         "satellites": msg.satellites_visible, 
@@ -403,36 +469,32 @@ class MavlinkWorker(threading.Thread):
                         "vdop": vdop
                     }))
         elif mtype == "GLOBAL_POSITION_INT":
-            # Validate global position data
-            if (hasattr(msg, 'lat') and hasattr(msg, 'lon') and hasattr(msg, 'relative_alt')):
-                lat = msg.lat / 1e7
-                lon = msg.lon / 1e7
-                alt = msg.relative_alt / 1000.0
-                
-                # Validate data is finite and within valid range
-                if (math.isfinite(lat) and math.isfinite(lon) and math.isfinite(alt) and
-                    -90 <= lat <= 90 and -180 <= lon <= 180):
-                    self._out_queue.put(("gps_pos", {
-                        "timestamp": timestamp,
-                        "lat": lat, 
-                        "lon": lon, 
-                        "alt": alt
-                    }))
+            lat = msg.lat / 1e7
+            lon = msg.lon / 1e7
+            alt = msg.relative_alt / 1000.0
+            
+            # Validate data is finite and within valid range
+            if (math.isfinite(lat) and math.isfinite(lon) and math.isfinite(alt) and
+                -90 <= lat <= 90 and -180 <= lon <= 180):
+                self._out_queue.append(("gps_pos", {
+                    "timestamp": timestamp,
+                    "lat": lat, 
+                    "lon": lon, 
+                    "alt": alt
+                }))
         elif mtype == "SYS_STATUS":
-            # Validate system status data
-            if (hasattr(msg, 'voltage_battery') and hasattr(msg, 'current_battery') and hasattr(msg, 'battery_remaining')):
-                voltage = msg.voltage_battery / 1000.0
-                current = msg.current_battery / 100.0
-                remaining = msg.battery_remaining
-                
-                # Validate data is finite and within reasonable range
-                if (math.isfinite(voltage) and math.isfinite(current) and 
-                    voltage >= 0 and current >= -100 and 0 <= remaining <= 100):
-                    self._out_queue.put(("sys_status", {
-                        "timestamp": timestamp,
-                        "voltage": voltage, 
-                        "current": current, 
-                        "remaining": remaining
-                    }))
+            voltage = msg.voltage_battery / 1000.0
+            current = msg.current_battery / 100.0
+            remaining = msg.battery_remaining
+            
+            # Validate data is finite and within reasonable range
+            if (math.isfinite(voltage) and math.isfinite(current) and 
+                voltage >= 0 and current >= -100 and 0 <= remaining <= 100):
+                self._out_queue.append(("sys_status", {
+                    "timestamp": timestamp,
+                    "voltage": voltage, 
+                    "current": current, 
+                    "remaining": remaining
+                }))
         else:
-            self._out_queue.put(("debug", f"{mtype}: {msg}"))
\ No newline at end of file
+            self._out_queue.append(("debug", f"{mtype}: {msg}"))
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""
+ASRA GCS - Serial Port Scanner
+Enumerates serial ports off the GUI thread and shares the result between widgets
+"""
+
+import threading
+import time
+import serial.tools.list_ports
+from PyQt5.QtCore import QObject, QRunnable, QSignalBlocker, QThreadPool, pyqtSignal
+
+NO_PORTS_TEXT = "No ports detected"
+PORT_CACHE_TTL_SEC = 2.0  # Scans requested within this window reuse the last result
+
+# Last enumerated port labels ("COM3 - USB Serial"), shared by all widgets
+_PORT_CACHE = []
+
+
+def populate_port_combo(combo, ports):
+    """Fill a port combo box, keeping the current selection if still present"""
+    current = combo.currentText()
+    # Suppress the currentIndexChanged churn from clear/addItems
+    blocker = QSignalBlocker(combo)
+    combo.clear()
+    combo.addItems(ports if ports else [NO_PORTS_TEXT])
+    index = combo.findText(current)
+    if index >= 0:
+        combo.setCurrentIndex(index)
+    blocker.unblock()
+
+
+class _PortScanTask(QRunnable):
+    """Runs comports() on a pool thread"""
+
+    def __init__(self, scanner):
+        super().__init__()
+        self.scanner = scanner
+
+    def run(self):
+        try:
+            ports = [f"{p.device} - {p.description}" for p in serial.tools.list_ports.comports()]
+        except Exception:
+            ports = list(_PORT_CACHE)
+        self.scanner._scan_finished(ports)
+
+
+class PortScanner(QObject):
+    """
+    Background serial port enumeration
+    comports() can block for hundreds of ms with USB-serial adapters attached
+    """
+
+    ports_updated = pyqtSignal(list)  # port labels
+
+    def __init__(self):
+        super().__init__()
+        self._scanning = False
+        self._last_scan = None  # monotonic time of the last completed scan
+        self._lock = threading.Lock()
+
+    def cached_ports(self):
+        """Ports from the last completed scan (may be empty before the first one)"""
+        return list(_PORT_CACHE)
+
+    def refresh(self, force=False):
+        """
+        Start a background scan
+        Calls while a scan is running, or within PORT_CACHE_TTL_SEC of the last
+        one (unless forced), are coalesced into the existing result
+        """
+        with self._lock:
+            if self._scanning:
+                return
+            if (not force and self._last_scan is not None and
+                    time.monotonic() - self._last_scan < PORT_CACHE_TTL_SEC):
+                return
+            self._scanning = True
+        QThreadPool.globalInstance().start(_PortScanTask(self))
+
+    def _scan_finished(self, ports):
+        """Called on the pool thread; the signal is queued to GUI-thread receivers"""
+        global _PORT_CACHE
+        _PORT_CACHE = ports
+        with self._lock:
+            self._scanning = False
+            self._last_scan = time.monotonic()
+        self.ports_updated.emit(ports)
+
+
+_scanner = None
+
+
+def get_port_scanner() -> PortScanner:
+    """Get the shared scanner (create from the GUI thread)"""
+    global _scanner
+    if _scanner is None:
+        _scanner = PortScanner()
+    return _scanner
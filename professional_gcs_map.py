@@ -11,6 +11,8 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import threading
+import heapq
+import itertools
 from collections import deque, OrderedDict
 from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
@@ -21,23 +23,37 @@ import sqlite3
 from PIL import Image
 import io
 
-from PyQt5 import QtCore, QtGui, QtWidgets
+from PyQt5 import QtGui, QtWidgets
 from PyQt5.QtCore import Qt, QPointF, QRectF, QTimer, pyqtSignal, QThread, QMutex, QMutexLocker
 from PyQt5.QtGui import QPainter, QPen, QBrush, QColor, QFont, QPixmap, QPolygonF, QPainterPath
 from PyQt5.QtWidgets import QWidget, QMenu, QAction
 
 # Import our optimized config and monitoring
 try:
-    from config import config, MapProvider as ConfigMapProvider
+    from config import config, CFG, MapProvider as ConfigMapProvider
     from performance_monitor import PerformanceMonitor, monitor_tile_download
     from logging_config import get_logger
 except ImportError:
     # Fallback for standalone use
     config = None
+    CFG = None
     ConfigMapProvider = None
     PerformanceMonitor = None
     get_logger = logging.getLogger
 
+# Persistent cache write batching
+TILE_WRITE_BATCH_SIZE = 64
+TILE_WRITE_FLUSH_INTERVAL_SEC = 0.5
+
+# Download priorities (lower is served first)
+TILE_PRIORITY_VISIBLE = 0
+TILE_PRIORITY_PREFETCH = 10
+
+# Flight path prefetch
+PREFETCH_INTERVAL_MS = 1000
+PREFETCH_MIN_SPEED_MS = 0.5  # Don't prefetch for a hovering/parked UAV
+EARTH_RADIUS_M = 6371000.0
+
 class MapProvider(Enum):
     """Free and open-source map providers only"""
     OPENSTREETMAP = "OpenStreetMap"
@@ -67,12 +83,20 @@ class PersistentTileCache:
         os.makedirs(cache_dir, exist_ok=True)
         self.db_path = os.path.join(cache_dir, "tiles.db")
         self.logger = get_logger("tile_cache")
+        
+        # Downloaded tiles are buffered and written in one transaction per batch
+        self._pending = {}  # key -> row tuple, insertion ordered
+        self._pending_lock = threading.Lock()
+        self._last_flush = time.time()
+        
         self._init_database()
         
     def _init_database(self):
         """Initialize SQLite database for tile storage"""
         try:
             with sqlite3.connect(self.db_path) as conn:
+                # WAL lets readers proceed while a batch is being written
+                conn.execute("PRAGMA journal_mode=WAL")
                 conn.execute("""
                     CREATE TABLE IF NOT EXISTS tiles (
                         key TEXT PRIMARY KEY,
@@ -94,39 +118,74 @@ class PersistentTileCache:
         """Generate unique key for tile"""
         return f"{provider}_{z}_{x}_{y}"
     
-    def get_tile(self, provider: str, z: int, x: int, y: int) -> Optional[QPixmap]:
-        """Get tile from cache"""
+    def get_tile_data(self, provider: str, z: int, x: int, y: int) -> Optional[bytes]:
+        """Get encoded tile bytes from cache"""
         try:
             key = self.get_tile_key(provider, z, x, y)
+            
+            # Tiles waiting for the next batch write are served from memory
+            with self._pending_lock:
+                row = self._pending.get(key)
+            if row:
+                return row[5]
+            
             # Use check_same_thread=False and timeout to prevent blocking
             with sqlite3.connect(self.db_path, timeout=0.5, check_same_thread=False) as conn:
                 cursor = conn.execute("SELECT data FROM tiles WHERE key = ?", (key,))
                 row = cursor.fetchone()
                 if row:
-                    pixmap = QPixmap()
-                    if pixmap.loadFromData(row[0]):
-                        return pixmap
+                    return row[0]
         except Exception as e:
             self.logger.debug(f"Cache miss for {provider} {z}/{x}/{y}: {e}")
         return None
     
+    def get_tile(self, provider: str, z: int, x: int, y: int) -> Optional[QPixmap]:
+        """Get tile from cache"""
+        data = self.get_tile_data(provider, z, x, y)
+        if data:
+            pixmap = QPixmap()
+            if pixmap.loadFromData(data):
+                return pixmap
+        return None
+    
     def store_tile(self, provider: str, z: int, x: int, y: int, data: bytes):
-        """Store tile in cache (non-blocking)"""
+        """Queue tile for the next batched cache write (non-blocking)"""
+        key = self.get_tile_key(provider, z, x, y)
+        row = (key, provider, z, x, y, data, int(time.time()), len(data))
+        
+        with self._pending_lock:
+            self._pending[key] = row
+            batch_full = len(self._pending) >= TILE_WRITE_BATCH_SIZE
+        
+        if batch_full:
+            self.flush()
+    
+    def flush_if_due(self):
+        """Write pending tiles if the flush interval has elapsed"""
+        if self._pending and time.time() - self._last_flush >= TILE_WRITE_FLUSH_INTERVAL_SEC:
+            self.flush()
+    
+    def flush(self):
+        """Write all pending tiles in a single transaction"""
+        with self._pending_lock:
+            if not self._pending:
+                return
+            rows = list(self._pending.values())
+            self._pending.clear()
+            self._last_flush = time.time()
+        
         try:
-            key = self.get_tile_key(provider, z, x, y)
-            timestamp = int(time.time())
-            size = len(data)
-            
             # Use timeout and check_same_thread=False to prevent blocking
             with sqlite3.connect(self.db_path, timeout=0.5, check_same_thread=False) as conn:
-                conn.execute("""
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.executemany("""
                     INSERT OR REPLACE INTO tiles (key, provider, z, x, y, data, timestamp, size)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (key, provider, z, x, y, data, timestamp, size))
+                """, rows)
                 
         except Exception as e:
             # Don't log errors aggressively to avoid spam
-            pass
+            self.logger.debug(f"Failed to write {len(rows)} cached tiles: {e}")
     
     def cleanup_old_tiles(self, max_age_days: int = 30, max_size_mb: int = 500):
         """Clean up old tiles to maintain cache size"""
@@ -162,13 +221,18 @@ class TileDownloadManager(QThread):
     
     def __init__(self):
         super().__init__()
-        self.download_queue = deque()
-        self.active_downloads = set()
+        self.download_queue = []  # heap of (priority, seq, tile_key)
+        self.queued = {}  # tile_key -> priority of its live heap entry
+        self.active_downloads = set()  # queued and in-flight tile keys
+        self.in_flight = 0
+        self._seq = itertools.count()  # FIFO order within a priority
         self.running = True
         self.lock = threading.Lock()
+        self.queue_ready = threading.Condition(self.lock)  # Wakes run() when tiles are queued
         
         # Use config values if available
-        max_workers = config.get("network", "max_concurrent_downloads", 4) if config else 4
+        max_workers = CFG.network_max_concurrent_downloads if CFG else 16
+        self.max_workers = max_workers
         self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="TileDownload")
         
         # Performance monitoring
@@ -182,23 +246,20 @@ class TileDownloadManager(QThread):
         self.cache_hits = 0
         self.cache_misses = 0
         
-        # Optimized HTTP session for faster downloads
-        self.session = requests.Session()
+        # Downloaded tiles are re-encoded once in this format before caching
+        self.tile_format = CFG.map_tile_format if CFG else "webp"
         
-        # Use config values if available
-        retry_total = config.get("network", "retry_attempts", 2) if config else 2
-        retry_delay = config.get("network", "retry_delay", 0.1) if config else 0.1
-        pool_size = config.get("network", "connection_pool_size", 10) if config else 10
-        timeout = config.get("network", "download_timeout", 5) if config else 5
-        
-        retry_strategy = Retry(
-            total=retry_total,
-            backoff_factor=retry_delay,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy, pool_connections=pool_size, pool_maxsize=pool_size)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        # Keep-alive HTTP session shared by every provider (and every map widget)
+        if config:
+            self.session = config.get_http_session()
+        else:
+            # Standalone fallback: private pooled session
+            self.session = requests.Session()
+            retry_strategy = Retry(total=2, backoff_factor=0.1, status_forcelist=[429, 500, 502, 503, 504])
+            adapter = HTTPAdapter(max_retries=retry_strategy, pool_connections=max_workers, pool_maxsize=max_workers)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+            self.session.headers.update({'User-Agent': "ASRA-GCS/2.0", 'Accept': 'image/*,*/*;q=0.8'})
         
         # Free and open-source provider URLs only
         self.providers = {
@@ -220,55 +281,64 @@ class TileDownloadManager(QThread):
             MapProvider.STAMEN_TONER: ['a', 'b', 'c', 'd']
         }
         
-    def request_tile(self, provider: MapProvider, z: int, x: int, y: int):
+        # Bound str.format per template so URL building skips per-tile lookups
+        self._url_formats = {provider: url.format for provider, url in self.providers.items()}
+        
+    def request_tile(self, provider: MapProvider, z: int, x: int, y: int, priority: int = TILE_PRIORITY_VISIBLE):
         """Request tile download with cache check"""
         # First check persistent cache
-        cached_tile = self.cache.get_tile(provider.value, z, x, y)
-        if cached_tile:
+        cached_data = self.cache.get_tile_data(provider.value, z, x, y)
+        if cached_data:
             self.cache_hits += 1
             if self.performance_monitor:
                 self.performance_monitor.log_tile_cached()
-            # Convert QPixmap to bytes before emitting
-            byte_array = QtCore.QByteArray()
-            buffer = QtCore.QBuffer(byte_array)
-            buffer.open(QtCore.QIODevice.WriteOnly)
-            cached_tile.save(buffer, "PNG")  # Assuming PNG format for cached tiles
-            
-            self.tile_ready.emit(z, x, y, byte_array.data(), provider.value)
+            # Emit stored bytes as-is; the map decodes WebP/PNG/JPEG alike
+            self.tile_ready.emit(z, x, y, cached_data, provider.value)
             return
             
         self.cache_misses += 1
         tile_key = (provider.value, z, x, y)
         
         with self.lock:
-            # Check if already downloading or in queue
-            if tile_key not in self.active_downloads:
-                # Check if not already in queue
-                queue_keys = {(item[0], item[1], item[2], item[3]) for item in self.download_queue}
-                if tile_key not in queue_keys:
-                    self.download_queue.append((provider.value, z, x, y))
-                    self.active_downloads.add(tile_key)
+            if tile_key in self.active_downloads:
+                # Already in flight, or queued at the same or a better priority
+                queued_priority = self.queued.get(tile_key)
+                if queued_priority is None or queued_priority <= priority:
+                    return
+            # New tile, or a prefetched tile that has become visible
+            self.queued[tile_key] = priority
+            self.active_downloads.add(tile_key)
+            heapq.heappush(self.download_queue, (priority, next(self._seq), tile_key))
+            self.queue_ready.notify()
     
     def run(self):
-        """Optimized download loop"""
+        """Dispatch loop - keeps every pool worker busy, best priority first"""
         self.logger.info("Tile download manager started")
         
         while self.running:
             try:
-                if self.download_queue:
-                    with self.lock:
-                        if self.download_queue:
-                            provider_name, z, x, y = self.download_queue.popleft()  # Use deque.popleft() for efficiency
-                            provider = MapProvider(provider_name)
-                        else:
-                            time.sleep(0.05)
-                            continue
+                with self.queue_ready:
+                    if self.running and (not self.download_queue or self.in_flight >= self.max_workers):
+                        self.queue_ready.wait(TILE_WRITE_FLUSH_INTERVAL_SEC)
                     
-                    # Submit download task
+                    # Only fill free workers so later visible tiles can still jump prefetched ones
+                    batch = []
+                    while self.download_queue and self.in_flight < self.max_workers:
+                        priority, _, tile_key = heapq.heappop(self.download_queue)
+                        if self.queued.get(tile_key) != priority:
+                            continue  # Superseded by a higher-priority entry
+                        del self.queued[tile_key]
+                        self.in_flight += 1
+                        batch.append(tile_key)
+                
+                # Write buffered tiles outside the queue lock
+                self.cache.flush_if_due()
+                
+                # Downloads are latency-bound, so keep all pool workers busy
+                for provider_name, z, x, y in batch:
+                    provider = MapProvider(provider_name)
                     future = self.executor.submit(self._download_tile, provider, z, x, y)
                     future.add_done_callback(lambda f, p=provider_name, zz=z, xx=x, yy=y: self._download_complete(p, zz, xx, yy))
-                else:
-                    time.sleep(0.1)  # Longer sleep when queue is empty
                     
             except Exception as e:
                 self.logger.error(f"Error in download loop: {e}")
@@ -281,22 +351,13 @@ class TileDownloadManager(QThread):
         try:
             url = self._get_tile_url(provider, z, x, y)
             
-            # Use configured user agent
-            user_agent = config.get("network", "user_agent", "ASRA-GCS/2.0") if config else "ASRA-GCS/2.0"
-            timeout = config.get("network", "download_timeout", 5) if config else 5
-            
-            headers = {
-                'User-Agent': user_agent,
-                'Accept': 'image/*,*/*;q=0.8',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-                'Cache-Control': 'max-age=3600'  # Hint for caching
-            }
+            timeout = CFG.network_download_timeout if CFG else 5
             
-            response = self.session.get(url, timeout=timeout, headers=headers, stream=False)
+            # User agent and accept headers are set once on the session
+            response = self.session.get(url, timeout=timeout, stream=False)
             
             if response.status_code == 200:
-                image_data = response.content
+                image_data = self._encode_tile(response.content)
                 
                 # Store in persistent cache
                 self.cache.store_tile(provider.value, z, x, y, image_data)
@@ -325,19 +386,33 @@ class TileDownloadManager(QThread):
         
         return None
     
+    def _encode_tile(self, image_data: bytes) -> bytes:
+        """Re-encode downloaded PNG/JPEG tile as WebP for smaller cache entries"""
+        if self.tile_format != "webp":
+            return image_data
+        
+        try:
+            out = io.BytesIO()
+            with Image.open(io.BytesIO(image_data)) as image:
+                image.save(out, "WEBP", quality=85, method=4)
+            encoded = out.getvalue()
+            # Keep the original if it is already the smaller encoding
+            return encoded if len(encoded) < len(image_data) else image_data
+        except Exception as e:
+            self.logger.debug(f"WebP encode failed, caching original tile: {e}")
+            return image_data
+    
     def _get_tile_url(self, provider: MapProvider, z: int, x: int, y: int) -> str:
         """Generate tile URL for free providers"""
-        url_template = self.providers[provider]
+        url_format = self._url_formats[provider]
         
         # Handle providers with multiple servers for load balancing
-        if provider in self.server_lists:
-            servers = self.server_lists[provider]
+        servers = self.server_lists.get(provider)
+        if servers:
             # Use simple hash-based server selection for consistency
-            server_index = (x + y + z) % len(servers)
-            server = servers[server_index]
-            return url_template.format(z=z, x=x, y=y, s=server)
-        else:
-            return url_template.format(z=z, x=x, y=y)
+            server = servers[(x + y + z) % len(servers)]
+            return url_format(z=z, x=x, y=y, s=server)
+        return url_format(z=z, x=x, y=y)
     
     def get_cache_stats(self) -> dict:
         """Get cache statistics"""
@@ -353,14 +428,19 @@ class TileDownloadManager(QThread):
     
     def _download_complete(self, provider: str, z: int, x: int, y: int):
         """Mark download as complete"""
-        with self.lock:
+        with self.queue_ready:
             tile_key = (provider, z, x, y)
             self.active_downloads.discard(tile_key)
+            self.in_flight -= 1
+            self.queue_ready.notify()  # A worker is free for the next queued tile
     
     def stop(self):
         """Stop downloader"""
-        self.running = False
+        with self.queue_ready:
+            self.running = False
+            self.queue_ready.notify_all()
         self.executor.shutdown(wait=True)
+        self.cache.flush()
 
 class ProfessionalGCSMap(QWidget):
     """Professional GCS Map Widget - Optimized with free providers only"""
@@ -402,10 +482,13 @@ class ProfessionalGCSMap(QWidget):
             self.tile_size = 256
             self.current_provider = MapProvider.ESRI_SATELLITE
         
+        # Seconds ahead along each UAV's velocity vector to prefetch tiles for
+        self.prefetch_lookahead_sec = config.get("map", "prefetch_lookahead_sec", 10) if config else 10
+        
         # Optimized tile cache with configuration
         self.tile_cache = OrderedDict()  # In-memory cache (provider, z, x, y) -> QPixmap
-        self.max_cache_tiles = config.get("map", "max_cache_tiles", 400) if config else 400
-        self.cache_cleanup_threshold = config.get("map", "cache_cleanup_threshold", 450) if config else 450
+        self.max_cache_tiles = CFG.map_max_cache_tiles if CFG else 400
+        self.cache_cleanup_threshold = CFG.map_cache_cleanup_threshold if CFG else 450
         self.cache_lock = QMutex()
         self.cache_access_times = {}  # Track access times for better LRU
         
@@ -494,14 +577,26 @@ class ProfessionalGCSMap(QWidget):
         self.tile_update_timer.setInterval(50)  # Update UI every 50ms after tiles are ready
         self.tile_update_timer.timeout.connect(self.update)
         
+        # Shared timer for deferred tile requests (restarted, not stacked, on resize)
+        self.tile_request_timer = QTimer(self)
+        self.tile_request_timer.setSingleShot(True)
+        self.tile_request_timer.setInterval(100)
+        self.tile_request_timer.timeout.connect(self._request_visible_tiles)
+        
         # Setup widget
         self.setAttribute(Qt.WA_OpaquePaintEvent)
         self.setMouseTracking(True)
         self.setContextMenuPolicy(Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self._show_context_menu)
         
+        # Prefetch tiles along predicted flight paths
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setInterval(PREFETCH_INTERVAL_MS)
+        self.prefetch_timer.timeout.connect(self._prefetch_flight_path_tiles)
+        self.prefetch_timer.start()
+        
         # Initial tile request - minimal delay
-        QTimer.singleShot(100, self._request_visible_tiles)
+        self.tile_request_timer.start()
     
     def _start_tile_downloader(self):
         """Start tile downloader after UI is ready"""
@@ -596,6 +691,44 @@ class ProfessionalGCSMap(QWidget):
                 if tile_key not in self.tile_cache:
                     self.tile_downloader.request_tile(self.current_provider, self.zoom, x, y)
     
+    def _project_position(self, lat: float, lon: float, heading: float, distance_m: float) -> Tuple[float, float]:
+        """Project lat/lon distance_m along heading (degrees), flat-earth approximation"""
+        heading_rad = math.radians(heading)
+        d_lat = distance_m * math.cos(heading_rad) / EARTH_RADIUS_M
+        d_lon = distance_m * math.sin(heading_rad) / (EARTH_RADIUS_M * max(math.cos(math.radians(lat)), 1e-6))
+        return lat + math.degrees(d_lat), lon + math.degrees(d_lon)
+    
+    def _prefetch_flight_path_tiles(self):
+        """Queue low-priority tiles around where each UAV will be after the lookahead"""
+        if not hasattr(self, 'tile_downloader') or not self.tile_downloader:
+            return
+        if self.prefetch_lookahead_sec <= 0:
+            return
+        
+        tracks = [(p['lat'], p['lon'], p['heading'], p['speed']) for p in self.uav_positions.values()]
+        if self.uav_position:
+            tracks.append((self.uav_position[0], self.uav_position[1], self.uav_heading, self.uav_speed))
+        
+        n = 2 ** self.zoom
+        for lat, lon, heading, speed in tracks:
+            if speed < PREFETCH_MIN_SPEED_MS:
+                continue
+            
+            ahead_lat, ahead_lon = self._project_position(lat, lon, heading, speed * self.prefetch_lookahead_sec)
+            tile_x, tile_y = self._deg2tile(ahead_lat, ahead_lon, self.zoom)
+            
+            # Predicted tile plus its 1-tile neighborhood
+            for x in range(int(tile_x) - 1, int(tile_x) + 2):
+                for y in range(int(tile_y) - 1, int(tile_y) + 2):
+                    if not (0 <= x < n and 0 <= y < n):
+                        continue
+                    tile_key = (self.current_provider.value, self.zoom, x, y)
+                    with QMutexLocker(self.cache_lock):
+                        cached = tile_key in self.tile_cache
+                    if not cached:
+                        self.tile_downloader.request_tile(self.current_provider, self.zoom, x, y,
+                                                          priority=TILE_PRIORITY_PREFETCH)
+    
     def _on_tile_ready(self, z: int, x: int, y: int, image_data: bytes, provider: str):
         """Handle tile ready (optimized for non-blocking)"""
         # Quick check without expensive operations
@@ -1190,7 +1323,7 @@ class ProfessionalGCSMap(QWidget):
     def resizeEvent(self, event):
         """Handle resize"""
         super().resizeEvent(event)
-        QTimer.singleShot(100, self._request_visible_tiles)
+        self.tile_request_timer.start()
     
     # Public API - Mission Planner/QGroundControl compatible
     def set_provider(self, provider: MapProvider):
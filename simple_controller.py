@@ -18,6 +18,13 @@ class SimpleController:
         self.drone_manager = drone_manager
         self.drone_id = drone_id
         
+        # Handlers for ordered text messages (status, error, FCU statustext)
+        self._text_handlers = {
+            "status": self._handle_status,
+            "error": self._handle_error,
+            "statustext": self._handle_statustext,
+        }
+        
     def update_ui(self):
         """Poll worker and update UI with telemetry"""
         if not self.worker:
@@ -30,34 +37,33 @@ class SimpleController:
             print(f"Error getting updates from worker: {e}")
             return
         
+        # Text messages are kept in order; telemetry keeps only the newest value per channel
+        texts = []
+        latest = {}
         for msg_type, data in updates:
+            if msg_type in self._text_handlers:
+                texts.append((msg_type, data))
+            elif msg_type == "flight_mode":
+                # Flight mode (string)
+                latest[msg_type] = {'mode': data}
+            elif isinstance(data, dict):
+                # Telemetry data (dict) - attitude, gps, vfr_hud, etc.
+                # Merged so partial updates (data_rate) keep earlier keys
+                latest.setdefault(msg_type, {}).update(data)
+            # else: ignore debug or unknown messages
+        
+        for msg_type, data in texts:
             try:
-                # Handle different message types
-                if msg_type == "status":
-                    # Connection status message (string)
-                    self._handle_status(data)
-                elif msg_type == "error":
-                    # Error message (string)
-                    self._handle_error(data)
-                elif msg_type == "flight_mode":
-                    # Flight mode (string)
-                    self.drone_manager.update_telemetry(
-                        self.drone_id, 'flight_mode', {'mode': data}
-                    )
-                elif msg_type == "statustext":
-                    # Status text from FCU (string)
-                    self._handle_statustext(data)
-                elif isinstance(data, dict):
-                    # Telemetry data (dict) - attitude, gps, vfr_hud, etc.
-                    self.drone_manager.update_telemetry(
-                        self.drone_id,
-                        msg_type,
-                        data
-                    )
-                # else: ignore debug or unknown messages
-                    
+                self._text_handlers[msg_type](data)
             except Exception as e:
                 print(f"Error processing {msg_type}: {e}")
+        
+        # One telemetry update per channel, delivered to the UI as a single batch
+        if latest:
+            try:
+                self.drone_manager.update_telemetry_batch(self.drone_id, list(latest.items()))
+            except Exception as e:
+                print(f"Error processing telemetry batch: {e}")
     
     def _handle_status(self, status_text):
         """Handle connection status updates"""
@@ -0,0 +1,23 @@
+"""
+ASRA GCS - Shared Stylesheet Helpers
+Widgets carry one static stylesheet; variants are selected by dynamic properties
+"""
+
+
+def set_style_property(widget, name, value):
+    """Switch a QSS-selected dynamic property; repolishes instead of re-parsing a stylesheet"""
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+
+
+def qss_rules(template, rows):
+    """
+    One QSS rule per row, concatenated
+    template is a str.format pattern ({0}, {1}, ... per row field; braces doubled);
+    rows holds tuples, or single values for one-field templates
+    """
+    return "".join(template.format(*(row if isinstance(row, tuple) else (row,))) for row in rows)
@@ -0,0 +1,42 @@
+"""
+ASRA GCS - Telemetry Label Text
+Precompiled value formatters and batched label updates shared by the telemetry views
+"""
+
+# Precompiled telemetry formatters
+fmt_angle = "{:.1f}°".format
+fmt_coord = "{:.6f}".format
+fmt_volt = "{:.1f}V".format
+fmt_amp = "{:.1f}A".format
+fmt_speed = "{:.1f}m/s".format
+fmt_percent = "{:.0f}%".format
+_fmt_m = "{:.0f}m".format
+_fmt_km = "{:.1f}km".format
+
+
+def fmt_altitude(alt):
+    """Metres below 1 km, kilometres above"""
+    return _fmt_m(alt) if alt < 1000 else _fmt_km(alt / 1000)
+
+
+def set_label_texts(widget, shown, pairs):
+    """
+    Apply (label, text) pairs, calling setText only where the text changed
+
+    Args:
+        widget: Ancestor of the labels; repaints once for the whole batch
+        shown: Dict of label -> last applied text, updated in place
+        pairs: Iterable of (label, text)
+    """
+    changed = [(label, text) for label, text in pairs if shown.get(label) != text]
+    if not changed:
+        return
+
+    # One repaint for the whole batch instead of one per label
+    widget.setUpdatesEnabled(False)
+    try:
+        for label, text in changed:
+            shown[label] = text
+            label.setText(text)
+    finally:
+        widget.setUpdatesEnabled(True)